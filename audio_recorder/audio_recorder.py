@@ -1,9 +1,23 @@
-import struct
 import platform
 import os
+import json
+import queue
+import shlex
+import threading
+import subprocess
+from array import array
+from datetime import datetime, timedelta
 from pvrecorder import PvRecorder
 import wave
 
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+SAMPLE_RATE = 16000  # PvRecorder always delivers 16 kHz, 16-bit mono
+FORMATS = ["flac", "wav", "pcm"]  # pcm: headerless signed 16-bit little-endian
+
 def show_audio_devices():
     """Display available audio devices"""
     print(f"\n[*] Available audio devices on {platform.system()}:\n")
@@ -28,8 +42,165 @@ def get_default_device():
             return i
     return 0
 
-def record_audio_file(dev_index=None, path="audio.wav"):
-    """Record audio to file with cross-platform support"""
+def open_chunk(path, fmt):
+    """Open an audio file for streaming 16-bit mono writes"""
+    if fmt == "flac":
+        return soundfile.SoundFile(path, "w", samplerate=SAMPLE_RATE, channels=1,
+                                   format="FLAC", subtype="PCM_16")
+    if fmt == "wav":
+        f = wave.open(path, "wb")
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        return f
+    return open(path, "wb")
+
+def write_chunk(f, fmt, data):
+    if fmt == "flac":
+        f.buffer_write(data, dtype="int16")
+    elif fmt == "wav":
+        f.writeframes(data)
+    else:
+        f.write(data)
+
+class ChunkEncoder(threading.Thread):
+    """
+    Background writer: the capture loop hands it frames and it encodes them to
+    disk, starting a new file every `rotate_seconds` (or never, if None).
+    Files are written under a ".part" name and renamed when complete, then
+    listed in manifest.jsonl and passed to `on_chunk`.
+    """
+    
+    def __init__(self, directory, fmt="flac", rotate_seconds=None, prefix="chunk",
+                 on_chunk=None, single_path=None):
+        super().__init__(daemon=True)
+        self.directory = directory
+        self.fmt = fmt
+        self.rotate_samples = int(rotate_seconds * SAMPLE_RATE) if rotate_seconds else None
+        self.prefix = prefix
+        self.on_chunk = on_chunk
+        self.single_path = single_path
+        self.manifest = os.path.join(directory, "manifest.jsonl")
+        self.frames = queue.Queue()
+        self.error = None
+        self.chunks = []
+        self.started = datetime.now()
+        self.total_samples = 0
+        self._file = None
+        self._path = None
+        self._chunk_samples = 0
+        self._chunk_start = 0
+    
+    def put(self, frame):
+        self.frames.put(frame)
+    
+    def finish(self):
+        """Flush everything queued, close the last file and wait for the thread"""
+        self.frames.put(None)
+        self.join()
+    
+    def _final_path(self, index):
+        if self.single_path:
+            return self.single_path
+        return os.path.join(self.directory, f"{self.prefix}_{index:04d}.{self.fmt}")
+    
+    def _open(self):
+        final = self._final_path(len(self.chunks) + 1)
+        self._path = final + ".part"
+        self._file = open_chunk(self._path, self.fmt)
+        self._chunk_samples = 0
+        self._chunk_start = self.total_samples
+    
+    def _close(self):
+        self._file.close()
+        final = self._path[:-len(".part")]
+        os.replace(self._path, final)
+        entry = {
+            "file": os.path.basename(final),
+            "format": self.fmt,
+            "sample_rate": SAMPLE_RATE,
+            "channels": 1,
+            "encoding": "s16le",
+            "samples": self._chunk_samples,
+            "duration": round(self._chunk_samples / SAMPLE_RATE, 3),
+            "start": (self.started + timedelta(seconds=self._chunk_start / SAMPLE_RATE)).isoformat(),
+            "offset": round(self._chunk_start / SAMPLE_RATE, 3),
+        }
+        if not self.single_path:
+            with open(self.manifest, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        self.chunks.append(final)
+        self._file = None
+        if self.on_chunk:
+            try:
+                self.on_chunk(final)
+            except Exception as e:
+                print(f"\nChunk handler failed for {final}: {e}")
+    
+    def run(self):
+        try:
+            while True:
+                frame = self.frames.get()
+                if frame is None:
+                    break
+                samples = array("h", frame)
+                while samples:
+                    if self._file is None:
+                        self._open()
+                    room = len(samples)
+                    if self.rotate_samples:
+                        room = min(room, self.rotate_samples - self._chunk_samples)
+                    write_chunk(self._file, self.fmt, samples[:room].tobytes())
+                    self._chunk_samples += room
+                    self.total_samples += room
+                    samples = samples[room:]
+                    if self.rotate_samples and self._chunk_samples >= self.rotate_samples:
+                        self._close()
+            if self._file is not None:
+                self._close()
+        except Exception as e:
+            self.error = e
+            # Keep draining so the capture loop never blocks on a dead writer
+            while self.frames.get() is not None:
+                pass
+
+class ChunkCommand:
+    """
+    on_chunk handler that starts `template` for each finished file without
+    waiting. {path} is replaced by the file, {rate} and {channels} by its
+    sample rate and channel count (needed to read headerless pcm chunks).
+    Finished commands are reaped as new chunks arrive; wait() reaps the rest.
+    """
+    
+    def __init__(self, template):
+        self.args = shlex.split(template)
+        self.running = []
+    
+    def __call__(self, path):
+        self.reap()
+        fields = {"{path}": path, "{rate}": str(SAMPLE_RATE), "{channels}": "1"}
+        args = []
+        for arg in self.args:
+            for field, value in fields.items():
+                arg = arg.replace(field, value)
+            args.append(arg)
+        self.running.append(subprocess.Popen(args, stdin=subprocess.DEVNULL))
+    
+    def reap(self):
+        for process in [p for p in self.running if p.poll() is not None]:
+            if process.returncode != 0:
+                print(f"\nChunk command exited with {process.returncode}: {' '.join(process.args)}")
+            self.running.remove(process)
+    
+    def wait(self):
+        if self.running:
+            print(f"Waiting for {len(self.running)} chunk command(s) to finish...")
+        for process in self.running:
+            process.wait()
+        self.reap()
+
+def capture(encoder, dev_index=None):
+    """Read frames from the device into `encoder` until CTRL+C"""
     system = platform.system()
     
     if dev_index is None:
@@ -45,47 +216,94 @@ def record_audio_file(dev_index=None, path="audio.wav"):
     print("Press CTRL+C to stop recording...")
     
     recorder = PvRecorder(device_index=dev_index, frame_length=frame_length)
-    audio = []
+    encoder.start()
     
     try:
         recorder.start()
-        while True:
-            frame = recorder.read()
-            audio.extend(frame)
-            
+        while encoder.error is None:
+            encoder.put(recorder.read())
     except KeyboardInterrupt:
         print("\nStopping recording...")
-        recorder.stop()
-        
-        # Save audio
-        try:
-            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
-            
-            with wave.open(path, 'w') as f:
-                f.setparams((1, 2, 16000, len(audio), "NONE", "NONE"))
-                f.writeframes(struct.pack("h" * len(audio), *audio))
-            
-            print(f"Audio saved to: {os.path.abspath(path)}")
-            return True
-            
-        except Exception as e:
-            print(f"Error saving audio: {e}")
-            return False
-        
     finally:
+        recorder.stop()
         recorder.delete()
+        encoder.finish()
     
-    return False
+    if encoder.error is not None:
+        print(f"Error saving audio: {encoder.error}")
+        return False
+    return True
+
+def record_audio_file(dev_index=None, path="audio.wav"):
+    """Record audio to file with cross-platform support"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fmt = "flac" if path.lower().endswith(".flac") else "wav"
+    if fmt == "flac" and soundfile is None:
+        print("Error: FLAC output needs the soundfile package (pip install soundfile)")
+        return False
+    
+    # Frames are written as they arrive instead of being held until the end
+    encoder = ChunkEncoder(os.path.dirname(os.path.abspath(path)), fmt=fmt, single_path=path)
+    if not capture(encoder, dev_index):
+        return False
+    print(f"Audio saved to: {os.path.abspath(path)}")
+    return True
+
+def record_rotating(dev_index=None, directory="recordings", rotate_minutes=10, fmt="flac", on_chunk=None):
+    """
+    Record a long session as a series of files, one every `rotate_minutes`,
+    in a new session folder below `directory` with a manifest.jsonl. Each
+    finished file is handed to `on_chunk` while recording continues.
+    """
+    if fmt == "flac" and soundfile is None:
+        print("Note: soundfile not installed, writing WAV chunks instead of FLAC")
+        fmt = "wav"
+    
+    session = os.path.join(directory, datetime.now().strftime("session_%Y%m%d_%H%M%S"))
+    os.makedirs(session, exist_ok=True)
+    encoder = ChunkEncoder(session, fmt=fmt, rotate_seconds=rotate_minutes * 60, on_chunk=on_chunk)
+    
+    print(f"Writing {fmt} chunks of {rotate_minutes} minute(s) to: {os.path.abspath(session)}")
+    ok = capture(encoder, dev_index)
+    print(f"Saved {len(encoder.chunks)} chunk(s), "
+          f"{timedelta(seconds=int(encoder.total_samples / SAMPLE_RATE))} of audio")
+    return ok
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Record audio from a microphone")
+    parser.add_argument("--device", type=int, help="Audio device index (default: first microphone)")
+    parser.add_argument("--output", default="audio.wav",
+                        help="Single output file, .wav or .flac (default: audio.wav)")
+    parser.add_argument("--rotate-minutes", type=float,
+                        help="Write a new file every N minutes into a session folder instead")
+    parser.add_argument("--directory", default="recordings",
+                        help="Where session folders are created with --rotate-minutes (default: recordings)")
+    parser.add_argument("--format", default="flac", choices=FORMATS,
+                        help="Chunk format with --rotate-minutes; flac needs soundfile, pcm is raw "
+                             "16 kHz signed 16-bit little-endian mono without a header (default: flac)")
+    parser.add_argument("--on-chunk", metavar="COMMAND",
+                        help='Run COMMAND for every finished chunk, e.g. '
+                             '"python whisper_cross_platform.py --audio {path} --output {path}"; '
+                             '{rate} and {channels} are filled in too, e.g. for pcm: '
+                             '"ffmpeg -f s16le -ar {rate} -ac {channels} -i {path} {path}.wav"')
+    args = parser.parse_args()
     
     show_audio_devices()
     
     print('\n[*] Starting audio recording...\n')
     
-    recording = record_audio_file()
-
+    if args.rotate_minutes:
+        on_chunk = ChunkCommand(args.on_chunk) if args.on_chunk else None
+        recording = record_rotating(args.device, args.directory, args.rotate_minutes,
+                                    args.format, on_chunk)
+        if on_chunk:
+            on_chunk.wait()
+    else:
+        recording = record_audio_file(args.device, args.output)
+    
     if recording:
         print("Recording completed successfully!")
     else:
-        print("Recording failed!")
\ No newline at end of file
+        print("Recording failed!")
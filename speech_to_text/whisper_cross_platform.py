@@ -1,26 +1,24 @@
-import whisper
 import platform
 import os
+import sys
+import time
 
-def load_whisper_model(model_size="base"):
-    """Load Whisper model with automatic device detection"""
+# whisper (and torch) are imported inside the functions that need them so that
+# --help and argument errors do not wait for torch to load.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils"))
+from whisper_engines import ENGINES, create_engine
+from audio_window_cache import WindowCache, split_windows
+
+def load_whisper_model(model_size="base", engine_name="openai"):
+    """Load a Whisper inference engine with automatic device detection"""
     system = platform.system()
-    print(f"Loading Whisper model '{model_size}' on {system}...")
+    print(f"Loading Whisper model '{model_size}' ({engine_name} engine) on {system}...")
     
     try:
-        import torch
-        # Simple device detection across platforms
-        if torch.cuda.is_available():
-            device = "cuda"
-            print(f"Using GPU (CUDA)")
-        elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-            device = "mps" 
-            print(f"Using GPU (Apple MPS)")
-        else:
-            device = "cpu"
-            print(f"Using CPU")
-        
-        return whisper.load_model(model_size, device=device)
+        engine = create_engine(engine_name, model_size).load()
+        device_names = {"cuda": "GPU (CUDA)", "mps": "GPU (Apple MPS)", "cpu": "CPU"}
+        print(f"Using {device_names.get(engine.device, engine.device)}")
+        return engine
     except Exception as e:
         print(f"Error loading model: {e}")
         return None
@@ -33,12 +31,15 @@ def seconds_to_srt_time(seconds):
     millisecs = int((seconds % 1) * 1000)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
 
-def transcribe_audio_file(audio_path, model_size="base", output_base_name="transcription"):
-    """Transcribe audio file with chunking support"""
-    model = load_whisper_model(model_size)
-    if not model:
+def transcribe_audio_file(audio_path, model_size="base", output_base_name="transcription", engine_name="openai",
+                          window_cache=False):
+    """Transcribe audio file with chunking support; optionally reuse chunks seen before"""
+    engine = load_whisper_model(model_size, engine_name)
+    if not engine:
         return False
     
+    import whisper
+    
     transcript_txt = f"{output_base_name}.txt"
     transcript_srt = f"{output_base_name}.srt"
     
@@ -51,9 +52,15 @@ def transcribe_audio_file(audio_path, model_size="base", output_base_name="trans
         sample_rate = whisper.audio.SAMPLE_RATE
         chunk_samples = chunk_duration * sample_rate
         
-        # Split audio into chunks
+        # Split audio into chunks. The window cache needs chunks cut at pauses
+        # (at most 30 s) so repeated audio is cut the same way in every file
         total_samples = audio.shape[0]
-        chunks = [audio[i:i+chunk_samples] for i in range(0, total_samples, chunk_samples)]
+        if window_cache:
+            bounds = split_windows(audio, sample_rate)
+        else:
+            bounds = [(i, min(i + chunk_samples, total_samples)) for i in range(0, total_samples, chunk_samples)]
+        chunks = [audio[start:end] for start, end in bounds]
+        cache = None
         
         print(f"Processing {len(chunks)} chunks...")
         
@@ -63,19 +70,25 @@ def transcribe_audio_file(audio_path, model_size="base", output_base_name="trans
         
         for i, chunk in enumerate(chunks):
             try:
-                chunk = whisper.pad_or_trim(chunk)
-                mel = whisper.log_mel_spectrogram(chunk).to(model.device)
-                
                 # Detect language for first chunk only
                 if i == 0:
-                    _, probs = model.detect_language(mel)
-                    detected_language = max(probs, key=probs.get)
+                    detected_language, _ = engine.detect_language(chunk)
                     print(f"Detected language: {detected_language}")
+                    if window_cache:
+                        cache = WindowCache(f"{model_size}-{engine_name}-{detected_language}")
                 
-                options = whisper.DecodingOptions()
-                result = whisper.decode(model, mel, options)
+                key, entry = cache.lookup(chunk) if cache else (None, None)
+                if entry is not None:
+                    text = "".join(segment["text"] for segment in entry["segments"])
+                else:
+                    started = time.perf_counter()
+                    result = engine.transcribe_window(chunk, language=detected_language, verbose=None)
+                    text = result["text"]
+                    if cache:
+                        cache.store(key, chunk, result["segments"], time.perf_counter() - started,
+                                    language=detected_language)
                 
-                transcription.append(result.text.strip())
+                transcription.append(text.strip())
                 print(f"Processed chunk {i + 1}/{len(chunks)}")
                 
             except Exception as e:
@@ -94,14 +107,16 @@ def transcribe_audio_file(audio_path, model_size="base", output_base_name="trans
         with open(transcript_srt, 'w', encoding='utf-8') as f:
             for i, text in enumerate(transcription):
                 if text.strip() and text != "[ERROR]":
-                    start_time = i * chunk_duration
-                    end_time = (i + 1) * chunk_duration
+                    start_time = bounds[i][0] / sample_rate
+                    end_time = bounds[i][1] / sample_rate
                     
                     f.write(f"{i + 1}\n")
                     f.write(f"{seconds_to_srt_time(start_time)} --> {seconds_to_srt_time(end_time)}\n")
                     f.write(f"{text.strip()}\n\n")
         
         print(f"SRT saved: {transcript_srt}")
+        if cache:
+            print(cache.summary())
         print(f"\nTranscription ({detected_language}):")
         print("-" * 50)
         print(full_transcription)
@@ -115,12 +130,15 @@ def transcribe_audio_file(audio_path, model_size="base", output_base_name="trans
 # Command line usage
 if __name__ == "__main__":
     import argparse
-    import sys
     
     parser = argparse.ArgumentParser(description="Cross-platform Whisper transcription")
     parser.add_argument("--audio", default="output_audio.wav", help="Audio file to transcribe")
     parser.add_argument("--model", default="base", help="Whisper model size")
     parser.add_argument("--output", default="transcription", help="Output base name")
+    parser.add_argument("--engine", default="openai", choices=list(ENGINES),
+                        help="Inference engine: openai (stock) or int8 (quantized, CPU)")
+    parser.add_argument("--window-cache", action="store_true",
+                        help="Reuse transcripts of audio chunks seen in earlier files")
     
     args = parser.parse_args()
     
@@ -131,7 +149,7 @@ if __name__ == "__main__":
     
     # Transcribe
     print(f"Starting transcription on {platform.system()}")
-    success = transcribe_audio_file(args.audio, args.model, args.output)
+    success = transcribe_audio_file(args.audio, args.model, args.output, args.engine, args.window_cache)
     
     if success:
         print("Transcription completed successfully!")
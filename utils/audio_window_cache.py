@@ -0,0 +1,374 @@
+import os
+import json
+import time
+from pathlib import Path
+
+# Window-level memoization of Whisper output. Audio is cut into windows of at
+# most 30 s at pauses, so a repeated intro, disclaimer or bumper is cut at the
+# same places wherever it occurs in a file. Each window gets a spectral
+# fingerprint (signs of band-energy differences across time and frequency, which
+# ignore gain and survive re-encoding with only a few flipped bits). A window
+# whose fingerprint is close enough to a stored one reuses the stored segments,
+# shifted to its own position, instead of running the model. numpy, hashlib and
+# base64 are imported only when used, keeping --help fast for the scripts that
+# import this module.
+#
+# The index is split into buckets by whole seconds of window duration, one
+# JSON-lines file each, loaded only when a window of nearby duration is looked
+# up. Within the loaded buckets every non-silent fingerprint row (a 15-bit
+# sub-fingerprint) points back to its window and frame. A lookup lets each row
+# vote for the stored windows holding the same row within MAX_SHIFT_FRAMES of
+# the same position, and fully compares only the MAX_CANDIDATES windows with
+# the most votes. A true repeat at a typical bit error rate (0.05-0.2) shares
+# dozens of exact rows; unrelated windows rarely share even one at a consistent
+# position.
+
+SAMPLE_RATE = 16000
+STATE_DIR = Path(os.environ.get("WHISPER_TRANSCRIPTION_HOME", Path.home() / ".whisper_transcription"))
+CACHE_DIR = STATE_DIR / "window_cache"
+
+MAX_WINDOW_SECONDS = 30   # one Whisper decoding window
+MIN_WINDOW_SECONDS = 10
+ANALYSIS_SECONDS = 0.1    # energy frames used to find pauses
+QUIET_DB_BELOW_PEAK = 30  # a frame this far below the loud frames counts as a pause
+MIN_PAUSE_FRAMES = 3
+
+FP_FRAME_SECONDS = 0.2
+FP_HOP_SECONDS = 0.05
+FP_BANDS = 16             # log-spaced 300-3000 Hz, giving 15 bits per frame
+MAX_BIT_ERROR_RATE = 0.32 # unrelated speech sits near 0.5
+MIN_FP_FRAMES = 20        # shorter windows (about 1 s) are never cached
+MAX_DURATION_DIFF = 1.0   # seconds
+MAX_SHIFT_FRAMES = 4      # fingerprint hops (0.2 s) of misalignment tolerated between cuts
+BOUNDARY_TOLERANCE = 0.2  # seconds a segment may cross a window edge and still be cacheable
+MAX_CANDIDATES = 8        # stored windows fully compared per lookup
+
+def frame_db(audio, frame_samples):
+    import numpy as np
+    count = len(audio) // frame_samples
+    frames = audio[:count * frame_samples].reshape(count, frame_samples).astype(np.float64)
+    return 10 * np.log10((frames ** 2).mean(axis=1) + 1e-10)
+
+def find_pauses(levels):
+    """(first, end) frame ranges of runs of quiet frames"""
+    import numpy as np
+
+    quiet = levels < np.percentile(levels, 95) - QUIET_DB_BELOW_PEAK
+    pauses = []
+    first = None
+    for index, is_quiet in enumerate(quiet):
+        if is_quiet and first is None:
+            first = index
+        elif not is_quiet and first is not None:
+            if index - first >= MIN_PAUSE_FRAMES:
+                pauses.append((first, index))
+            first = None
+    return pauses
+
+def split_windows(audio, sample_rate=SAMPLE_RATE):
+    """Cut audio into (start, end) sample ranges of at most 30 s, at pauses where possible"""
+    frame = int(ANALYSIS_SECONDS * sample_rate)
+    levels = frame_db(audio, frame)
+    if len(levels) == 0:
+        return [(0, len(audio))] if len(audio) else []
+    pauses = find_pauses(levels)
+
+    # A pause is a boundary when it is the longest one within MIN_WINDOW_SECONDS
+    # (earliest wins ties). That depends only on the audio around the pause, not
+    # on where the previous window started, so repeated content is cut the same
+    # way wherever it occurs. Windows start where speech resumes.
+    reach = MIN_WINDOW_SECONDS / ANALYSIS_SECONDS
+    cuts = []
+    for index, (first, end) in enumerate(pauses):
+        centre, length = (first + end) / 2, end - first
+        if all(length > other_end - other_first or (length == other_end - other_first and index < other)
+               for other, (other_first, other_end) in enumerate(pauses)
+               if other != index and abs((other_first + other_end) / 2 - centre) < reach):
+            cuts.append(end)
+
+    # Split anything longer than a decoding window at its longest pause, or hard
+    max_frames = int(MAX_WINDOW_SECONDS / ANALYSIS_SECONDS)
+    min_frames = int(MIN_WINDOW_SECONDS / ANALYSIS_SECONDS)
+    bounded = []
+    previous = 0
+    for cut in cuts + [len(levels)]:
+        while cut - previous > max_frames:
+            inside = [(end - first, end) for first, end in pauses
+                      if previous + min_frames <= end <= previous + max_frames]
+            previous = max(inside)[1] if inside else previous + max_frames
+            bounded.append(previous)
+        if 0 < cut < len(levels):
+            bounded.append(cut)
+            previous = cut
+
+    edges = [0] + [cut * frame for cut in bounded] + [len(audio)]
+    return [(start, end) for start, end in zip(edges[:-1], edges[1:]) if end > start]
+
+def fingerprint_bits(window, sample_rate=SAMPLE_RATE):
+    """Boolean matrix (frames x 15) of band-energy difference signs"""
+    import numpy as np
+
+    size = int(FP_FRAME_SECONDS * sample_rate)
+    hop = int(FP_HOP_SECONDS * sample_rate)
+    count = 1 + (len(window) - size) // hop if len(window) >= size else 0
+    if count < 2:
+        return np.zeros((0, FP_BANDS - 1), dtype=bool)
+    frames = np.lib.stride_tricks.sliding_window_view(window, size)[::hop][:count] * np.hanning(size)
+    power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+    freqs = np.fft.rfftfreq(size, 1 / sample_rate)
+    edges = np.geomspace(300, 3000, FP_BANDS + 1)
+    bands = np.stack([power[:, (freqs >= low) & (freqs < high)].sum(axis=1)
+                      for low, high in zip(edges[:-1], edges[1:])], axis=1)
+    log_bands = np.log(bands + 1e-10)
+    bits = np.diff(np.diff(log_bands, axis=1), axis=0) > 0
+    # Bits of near-silent frames only describe the noise floor: zero them so
+    # pauses compare equal across recordings
+    loudness = log_bands.max(axis=1)
+    quiet = loudness < loudness.max() - QUIET_DB_BELOW_PEAK * np.log(10) / 10
+    bits[quiet[1:] | quiet[:-1]] = False
+    return bits
+
+def _packed(raw):
+    """Stored fingerprint bytes back to one 2-byte row per frame"""
+    import numpy as np
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, 2)
+
+def _row_values(packed):
+    """One integer per fingerprint row (0 for silent frames)"""
+    import numpy as np
+    return (packed[:, 0].astype(np.uint16) << 8 | packed[:, 1]).tolist()
+
+def _best_alignment(query, stored):
+    """(bit error rate, shift) of the best alignment within MAX_SHIFT_FRAMES"""
+    import numpy as np
+
+    best = (1.0, 0)
+    for shift in range(-MAX_SHIFT_FRAMES, MAX_SHIFT_FRAMES + 1):
+        # query frame i against stored frame i + shift
+        q = query[max(0, -shift):]
+        r = stored[max(0, shift):]
+        common = min(len(q), len(r))
+        if common < min(len(query), len(stored)) * 0.8:
+            continue
+        q, r = q[:common], r[:common]
+        # Frames silent in both say nothing about whether the content matches
+        compared = np.count_nonzero(q.any(axis=1) | r.any(axis=1))
+        if compared < MIN_FP_FRAMES:
+            continue
+        rate = np.unpackbits(q ^ r).sum() / (compared * (FP_BANDS - 1))
+        best = min(best, (rate, shift))
+    return best
+
+class WindowCache:
+    """Fingerprint-indexed store of transcribed windows for one model configuration"""
+
+    def __init__(self, namespace, cache_dir=CACHE_DIR, sample_rate=SAMPLE_RATE):
+        self.directory = Path(cache_dir) / namespace
+        self.sample_rate = sample_rate
+        self.index_dir = self.directory / "index"
+        self._entries = {}  # key -> (duration, fingerprint rows packed as frames x 2 bytes)
+        self._rows = {}     # row value -> [(key, frame)] for the loaded buckets
+        self._loaded = set()
+        self.windows = 0
+        self.hits = 0
+        self.hit_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def _bucket_file(self, bucket):
+        return self.index_dir / f"{bucket}.jsonl"
+
+    def _add(self, key, duration, packed):
+        if key in self._entries:
+            return
+        self._entries[key] = (duration, packed)
+        for frame, value in enumerate(_row_values(packed)):
+            if value:
+                self._rows.setdefault(value, []).append((key, frame))
+
+    def _load_bucket(self, bucket):
+        """Read the index records of windows lasting `bucket` whole seconds, once"""
+        import base64
+
+        if bucket in self._loaded:
+            return
+        self._loaded.add(bucket)
+        try:
+            with open(self._bucket_file(bucket), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._add(record["key"], record["duration"], _packed(base64.b64decode(record["bits"])))
+                    except (ValueError, KeyError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+    def _match(self, packed, duration):
+        """
+        Key for these fingerprint rows, plus the key and frame shift of the
+        closest stored window (None if nothing is close enough)
+        """
+        import hashlib
+
+        key = hashlib.sha1(packed.tobytes()).hexdigest()
+        for bucket in range(int(duration - MAX_DURATION_DIFF), int(duration + MAX_DURATION_DIFF) + 1):
+            self._load_bucket(bucket)
+        if key in self._entries:
+            return key, key, 0
+
+        # Each row votes for stored windows with the same row at about the
+        # same position; only the best-supported candidates are compared
+        votes = {}
+        for frame, value in enumerate(_row_values(packed)):
+            for other, other_frame in self._rows.get(value, ()) if value else ():
+                if abs(other_frame - frame) <= MAX_SHIFT_FRAMES:
+                    votes[other] = votes.get(other, 0) + 1
+        candidates = sorted(votes, key=votes.get, reverse=True)[:MAX_CANDIDATES]
+
+        best, best_rate, best_shift = None, MAX_BIT_ERROR_RATE, 0
+        for other in candidates:
+            other_duration, other_packed = self._entries[other]
+            if abs(other_duration - duration) > MAX_DURATION_DIFF:
+                continue
+            rate, shift = _best_alignment(packed, other_packed)
+            if rate < best_rate:
+                best, best_rate, best_shift = other, rate, shift
+        return key, best, best_shift
+
+    def lookup(self, window, need_words=False):
+        """
+        Return (key, stored entry or None) for one window of audio. Segment times
+        in a returned entry are already relative to this window's start.
+        """
+        import numpy as np
+
+        duration = len(window) / self.sample_rate
+        self.windows += 1
+        bits = fingerprint_bits(window, self.sample_rate)
+        if bits.shape[0] < MIN_FP_FRAMES:
+            return None, None
+        key, match, shift = self._match(np.packbits(bits, axis=1), duration)
+        if match is not None:
+            try:
+                with open(self._entry_file(match), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                if entry.get("words") or not need_words:
+                    # Stored time t lines up with time t - shift hops in this window
+                    offset = -shift * FP_HOP_SECONDS
+                    entry["segments"] = [shift_segment(segment, offset) for segment in entry["segments"]
+                                         if segment["end"] + offset > 0]
+                    self.hits += 1
+                    self.hit_seconds += duration
+                    self.saved_seconds += entry.get("inference_seconds", 0.0)
+                    return key, entry
+            except (OSError, ValueError):
+                pass
+        return key, None
+
+    def store(self, key, window, segments, inference_seconds, language=None, words=False):
+        """Save a window's segments (times relative to the window start)"""
+        import base64
+        import numpy as np
+
+        if key is None:
+            return
+        packed = np.packbits(fingerprint_bits(window, self.sample_rate), axis=1)
+        duration = len(window) / self.sample_rate
+        entry = {
+            "duration": duration,
+            "language": language,
+            "words": words,
+            "inference_seconds": inference_seconds,
+            "segments": [{k: v for k, v in segment.items() if k not in ("id", "seek")}
+                         for segment in segments],
+        }
+        try:
+            entry_file = self._entry_file(key)
+            entry_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = entry_file.with_name(f"{entry_file.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, entry_file)
+
+            # Whole lines in append mode keep concurrent writers from interleaving
+            duration = round(duration, 3)
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._bucket_file(int(duration)), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "duration": duration,
+                                    "bits": base64.b64encode(packed.tobytes()).decode("ascii")}) + "\n")
+            if int(duration) in self._loaded:
+                self._add(key, duration, packed)
+        except OSError as e:
+            print(f"Warning: could not write window cache: {e}")
+
+    def transcribe(self, audio, transcribe, word_timestamps=False):
+        """
+        Transcribe a 16 kHz float32 array, reusing cached windows. Consecutive
+        uncached windows go to `transcribe(clip)` in one call, so the model keeps
+        its usual context; returns a whisper-style result dict.
+        """
+        windows = split_windows(audio, self.sample_rate)
+        lookups = [self.lookup(audio[start:end], need_words=word_timestamps) for start, end in windows]
+
+        segments = []
+        language = None
+        index = 0
+        while index < len(windows):
+            key, entry = lookups[index]
+            start, end = windows[index]
+            if entry is not None:
+                offset = start / self.sample_rate
+                segments.extend(shift_segment(segment, offset) for segment in entry["segments"])
+                language = language or entry.get("language")
+                index += 1
+                continue
+
+            last = index
+            while last + 1 < len(windows) and lookups[last + 1][1] is None:
+                last += 1
+            run_start, run_end = windows[index][0], windows[last][1]
+            started = time.perf_counter()
+            result = transcribe(audio[run_start:run_end])
+            elapsed = time.perf_counter() - started
+            language = language or result.get("language")
+
+            offset = run_start / self.sample_rate
+            run_segments = [shift_segment(segment, offset) for segment in result["segments"]]
+            segments.extend(run_segments)
+            self._store_run(audio, windows[index:last + 1], lookups[index:last + 1], run_segments,
+                            elapsed / max(run_end - run_start, 1), language, word_timestamps)
+            index = last + 1
+
+        for number, segment in enumerate(segments):
+            segment["id"] = number
+        return {"text": "".join(segment["text"] for segment in segments),
+                "segments": segments, "language": language}
+
+    def _store_run(self, audio, windows, lookups, segments, seconds_per_sample, language, words):
+        """Cache each window of a transcribed run that no segment straddles"""
+        for (start, end), (key, _) in zip(windows, lookups):
+            window_start, window_end = start / self.sample_rate, end / self.sample_rate
+            straddled = any(segment["start"] < edge - BOUNDARY_TOLERANCE and
+                            segment["end"] > edge + BOUNDARY_TOLERANCE
+                            for segment in segments for edge in (window_start, window_end))
+            if straddled:
+                continue
+            inside = [shift_segment(segment, -window_start) for segment in segments
+                      if window_start <= (segment["start"] + segment["end"]) / 2 < window_end]
+            self.store(key, audio[start:end], inside, (end - start) * seconds_per_sample, language, words)
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.windows if self.windows else 0.0
+
+    def summary(self):
+        return (f"Window cache: {self.hits}/{self.windows} windows reused ({self.hit_rate:.0%}), "
+                f"{self.hit_seconds:.0f}s of audio, ~{self.saved_seconds:.0f}s of inference saved")
+
+def shift_segment(segment, offset):
+    """Copy of a segment (and its words) moved by offset seconds"""
+    moved = dict(segment, start=segment["start"] + offset, end=segment["end"] + offset)
+    if "words" in segment:
+        moved["words"] = [dict(word, start=word["start"] + offset, end=word["end"] + offset)
+                          for word in segment["words"]]
+    return moved
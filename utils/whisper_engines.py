@@ -0,0 +1,179 @@
+# Inference engines for Whisper models. Every engine exposes the same three
+# operations - load(), transcribe_window() and detect_language() - so callers
+# can switch backends with a single --engine option; align_words() adds word
+# timings to segments transcribed without them. torch and whisper are only
+# imported when used, keeping this module cheap to import.
+
+ENGINE_DESCRIPTIONS = {
+    "openai": "Stock openai-whisper (fp32 on CPU, fp16 on GPU)",
+    "int8": "openai-whisper with dynamic int8 quantization of linear layers (CPU only)",
+}
+
+def detect_device():
+    """
+    Pick the default torch device: cuda if available, else cpu. MPS is only
+    used when asked for; whisper's sparse alignment_heads buffer cannot be
+    moved to it in current torch releases.
+    """
+    import torch
+    if torch.cuda.is_available():
+        return "cuda"
+    return "cpu"
+
+class WhisperEngine:
+    """Base class for Whisper inference backends"""
+
+    name = None
+
+    def __init__(self, model_name="base", device=None):
+        self.model_name = model_name
+        self.device = device
+        self.model = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def transcribe_window(self, audio, **options):
+        """Transcribe a file path or 16 kHz float32 array; returns whisper's result dict"""
+        raise NotImplementedError
+
+    def detect_language(self, audio):
+        """Return (language_code, probabilities) for the first 30 s of audio"""
+        raise NotImplementedError
+
+    def align_words(self, audio, segments, language="en", offset=0.0):
+        """Add "words" to already-transcribed segments; audio starts at `offset` seconds"""
+        raise NotImplementedError
+
+    def describe(self):
+        return f"{self.name} engine, model '{self.model_name}' on {self.device}"
+
+class OpenAIWhisperEngine(WhisperEngine):
+    """Stock openai-whisper inference"""
+
+    name = "openai"
+
+    def load(self):
+        if self.model is None:
+            import whisper
+            self.device = self.device or detect_device()
+            try:
+                self.model = whisper.load_model(self.model_name, device=self.device)
+            except (RuntimeError, NotImplementedError) as e:
+                if self.device != "mps":
+                    raise
+                print(f"Note: could not load model on mps ({e}); using cpu")
+                self.device = "cpu"
+                self.model = whisper.load_model(self.model_name, device="cpu")
+        return self
+
+    def transcribe_window(self, audio, **options):
+        self.load()
+        if self.device == "cpu":
+            options.setdefault("fp16", False)  # fp16 is unsupported on CPU; avoid the warning
+        return self.model.transcribe(audio, **options)
+
+    def detect_language(self, audio):
+        import whisper
+        self.load()
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+        audio = whisper.pad_or_trim(audio)
+        mel = whisper.log_mel_spectrogram(audio, n_mels=self.model.dims.n_mels).to(self.model.device)
+        _, probs = self.model.detect_language(mel)
+        return max(probs, key=probs.get), probs
+
+    def align_words(self, audio, segments, language="en", offset=0.0):
+        import whisper
+        from whisper.audio import HOP_LENGTH, N_SAMPLES, SAMPLE_RATE
+        from whisper.timing import add_word_timestamps
+        from whisper.tokenizer import get_tokenizer
+
+        self.load()
+        tokenizer = get_tokenizer(self.model.is_multilingual, num_languages=self.model.num_languages,
+                                  language=language, task="transcribe")
+
+        # Cross-attention alignment works on 30 s mel windows: group segments
+        # that fit in one window and align each group against its own audio
+        window_seconds = N_SAMPLES / SAMPLE_RATE
+        groups = []
+        for segment in segments:
+            if not segment.get("tokens"):
+                continue
+            if groups and segment["end"] - groups[-1][0]["start"] <= window_seconds:
+                groups[-1].append(segment)
+            else:
+                groups.append([segment])
+
+        for group in groups:
+            window_start = group[0]["start"]
+            first_sample = max(0, int((window_start - offset) * SAMPLE_RATE))
+            clip = audio[first_sample:first_sample + N_SAMPLES]
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(clip), n_mels=self.model.dims.n_mels)
+
+            # Work on window-relative copies; add_word_timestamps also rewrites
+            # segment boundaries, which we want to keep as transcribed
+            relative = [dict(segment, seek=0, start=segment["start"] - window_start,
+                             end=segment["end"] - window_start) for segment in group]
+            add_word_timestamps(segments=relative, model=self.model, tokenizer=tokenizer,
+                                mel=mel.to(self.model.device), num_frames=len(clip) // HOP_LENGTH,
+                                last_speech_timestamp=0.0)
+
+            for segment, aligned in zip(group, relative):
+                segment["words"] = [dict(word, start=round(word["start"] + window_start, 2),
+                                         end=round(word["end"] + window_start, 2))
+                                    for word in aligned.get("words", [])]
+        return segments
+
+class QuantizedWhisperEngine(OpenAIWhisperEngine):
+    """openai-whisper with linear layers dynamically quantized to int8 (CPU)"""
+
+    name = "int8"
+
+    def load(self):
+        if self.model is None:
+            import torch
+            import whisper
+
+            if self.device not in (None, "cpu"):
+                print(f"Note: int8 engine runs on CPU only (requested {self.device})")
+            self.device = "cpu"
+            model = whisper.load_model(self.model_name, device="cpu")
+
+            # whisper uses its own nn.Linear subclass, which quantize_dynamic does
+            # not recognise; swap in plain nn.Linear modules sharing the weights
+            for module in list(model.modules()):
+                for child_name, child in module.named_children():
+                    if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                        plain = torch.nn.Linear(child.in_features, child.out_features,
+                                                bias=child.bias is not None)
+                        plain.weight = child.weight
+                        plain.bias = child.bias
+                        setattr(module, child_name, plain)
+
+            self.model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return self
+
+ENGINES = {
+    OpenAIWhisperEngine.name: OpenAIWhisperEngine,
+    QuantizedWhisperEngine.name: QuantizedWhisperEngine,
+}
+
+def create_engine(engine_name="openai", model_name="base", device=None):
+    """Instantiate (but do not load) an engine by name"""
+    try:
+        engine_class = ENGINES[engine_name]
+    except KeyError:
+        raise ValueError(f"Unknown engine '{engine_name}'. Available: {', '.join(ENGINES)}")
+    return engine_class(model_name, device=device)
+
+# Usage example
+if __name__ == "__main__":
+    import platform
+
+    print(f"Platform: {platform.system()}")
+    print("Available engines:")
+    for name, description in ENGINE_DESCRIPTIONS.items():
+        print(f"  {name}: {description}")
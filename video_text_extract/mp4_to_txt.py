@@ -1,25 +1,129 @@
-import wave, math, contextlib
+import wave, contextlib, time, random, argparse, threading
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import speech_recognition as sr
-from moviepy.editor import AudioFileClip
 
 # ref: https://towardsdatascience.com/transcribing-interview-data-from-video-to-text-with-python-5cdb6689eea1
+#
+# The soundtrack is read once, chunk by chunk, while a bounded pool keeps several
+# recognition requests in flight. Results are written in order through a single
+# output handle. Pass --stand-in to replace Google with a local fake recognizer
+# of fixed latency, so concurrency speed-ups can be measured offline.
 
-transcribed_audio_file_name = "transcribed_speech.wav"
-video_file_name = "video.mp4"
-
-audioclip = AudioFileClip(video_file_name)
-audioclip.write_audiofile(transcribed_audio_file_name)
-
-with contextlib.closing(wave.open(transcribed_audio_file_name,'r')) as f:
-    frames = f.getnframes()
-    rate = f.getframerate()
-    duration = frames / float(rate)
-total_duration = math.ceil(duration / 60)
-r = sr.Recognizer()
-for i in range(0, total_duration):
-    with sr.AudioFile(transcribed_audio_file_name) as source:
-        audio = r.record(source, offset=i*60, duration=60)
-    f = open("transcription.txt", "a")
-    f.write(r.recognize_google(audio))
-    f.write(" ")
-f.close()
+def extract_audio(video_file_name, audio_file_name):
+    """Write the video soundtrack as 16 kHz mono 16-bit WAV"""
+    from moviepy.editor import AudioFileClip
+    audioclip = AudioFileClip(video_file_name)
+    audioclip.write_audiofile(audio_file_name, fps=16000, nbytes=2, ffmpeg_params=["-ac", "1"])
+    audioclip.close()
+
+# array typecodes for WAV sample widths; 8-bit WAV samples are unsigned
+SAMPLE_TYPECODES = {1: "B", 2: "h", 4: "i"}
+
+def downmix(frames, width, channels):
+    """Average interleaved channels into mono PCM of the same sample width"""
+    samples = array(SAMPLE_TYPECODES[width], frames)
+    mono = array(samples.typecode, [sum(frame) // channels for frame in
+                                    zip(*(samples[c::channels] for c in range(channels)))])
+    return mono.tobytes()
+
+def read_chunks(audio_file_name, chunk_seconds=60):
+    """Yield (index, AudioData) for consecutive chunks of a WAV file, opened once"""
+    with contextlib.closing(wave.open(audio_file_name, 'rb')) as f:
+        rate = f.getframerate()
+        width = f.getsampwidth()
+        channels = f.getnchannels()
+        if channels > 1 and width not in SAMPLE_TYPECODES:
+            raise ValueError(f"{audio_file_name}: cannot downmix {channels} channels of "
+                             f"{width * 8}-bit audio; convert it to mono first")
+        index = 0
+        while True:
+            frames = f.readframes(rate * chunk_seconds)
+            if not frames:
+                break
+            if channels > 1:
+                frames = downmix(frames, width, channels)  # WAVs not written by extract_audio
+            yield index, sr.AudioData(frames, rate, width)
+            index += 1
+
+def google_recognizer():
+    """recognize_google with one Recognizer per thread"""
+    local = threading.local()
+    def recognize(audio):
+        if not hasattr(local, "recognizer"):
+            local.recognizer = sr.Recognizer()
+        return local.recognizer.recognize_google(audio)
+    return recognize
+
+def stand_in_recognizer(latency=1.0, failure_rate=0.0):
+    """Offline fake with fixed latency (and optional transient failures)"""
+    def recognize(audio):
+        time.sleep(latency)
+        if random.random() < failure_rate:
+            raise sr.RequestError("stand-in transient failure")
+        seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        return f"[{seconds:.0f}s of speech]"
+    return recognize
+
+def recognize_with_retry(recognize, index, audio, retries=3, backoff=1.0):
+    """Recognize one chunk; retry transient errors with exponential backoff"""
+    for attempt in range(retries + 1):
+        try:
+            return recognize(audio)
+        except sr.UnknownValueError:
+            return ""  # no intelligible speech in this chunk
+        except (sr.RequestError, OSError) as e:
+            if attempt == retries:
+                print(f"Chunk {index}: giving up after {retries + 1} attempts: {e}")
+                return ""
+            delay = backoff * 2 ** attempt * (1 + random.random())
+            print(f"Chunk {index}: {e}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def transcribe_wav(audio_file_name, output_file_name, recognize, chunk_seconds=60,
+                   max_in_flight=4, retries=3, backoff=1.0):
+    """Stream chunks through a bounded pool, writing results in order"""
+    chunks = 0
+    with open(output_file_name, "a") as out, ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        pending = deque()
+        def write_oldest():
+            out.write(pending.popleft().result())
+            out.write(" ")
+            out.flush()
+        for index, audio in read_chunks(audio_file_name, chunk_seconds):
+            pending.append(pool.submit(recognize_with_retry, recognize, index, audio, retries, backoff))
+            chunks += 1
+            while len(pending) >= max_in_flight:
+                write_oldest()
+        while pending:
+            write_oldest()
+    return chunks
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Video to text with Google Speech Recognition")
+    parser.add_argument("--video", default="video.mp4", help="Source video (default: video.mp4)")
+    parser.add_argument("--wav", default="transcribed_speech.wav", help="Intermediate WAV file")
+    parser.add_argument("--output", default="transcription.txt", help="Transcript file (appended)")
+    parser.add_argument("--skip-extract", action="store_true", help="Reuse an existing --wav file")
+    parser.add_argument("--chunk-seconds", type=int, default=60, help="Seconds per request (default: 60)")
+    parser.add_argument("--workers", type=int, default=4, help="Requests in flight (default: 4)")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per chunk (default: 3)")
+    parser.add_argument("--stand-in", type=float, metavar="LATENCY",
+                        help="Use an offline fake recognizer with this latency in seconds")
+    parser.add_argument("--stand-in-failure-rate", type=float, default=0.0,
+                        help="Fraction of stand-in requests that fail transiently")
+    args = parser.parse_args()
+
+    if not args.skip_extract:
+        extract_audio(args.video, args.wav)
+
+    if args.stand_in is not None:
+        recognize = stand_in_recognizer(args.stand_in, args.stand_in_failure_rate)
+    else:
+        recognize = google_recognizer()
+
+    start = time.time()
+    chunks = transcribe_wav(args.wav, args.output, recognize, args.chunk_seconds,
+                            max_in_flight=args.workers, retries=args.retries)
+    print(f"Transcribed {chunks} chunks with {args.workers} in flight in {time.time() - start:.1f}s")
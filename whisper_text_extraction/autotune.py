@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Host Auto-Tuning
+Calibrates torch thread count, concurrent workers and segment length per host
+and model, and caches the result.
+
+A few seconds of synthetic speech-like audio are transcribed at several thread
+counts to measure real-time factor and resident memory. Two settings are kept:
+
+- single process (transcribe, watch, worker): the thread count with the lowest
+  real-time factor, so one video finishes as soon as possible
+- batch: the split of cores into worker processes x threads that transcribes
+  the most audio per wall second. whisper installs per-call hooks on the
+  model, so concurrent workers are separate processes, each with its own copy
+  of the model and its own thread pool (workers x threads <= cores, and their
+  combined memory must fit in RAM)
+
+Segment length is the longest that keeps every worker within its share of
+available memory.
+"""
+
+import os
+import json
+import math
+import time
+import socket
+from datetime import datetime
+
+from throughput_history import STATE_DIR
+
+AUTOTUNE_FILE = STATE_DIR / "autotune.json"
+
+SEGMENT_CHOICES = (60, 30, 20, 10)
+DEFAULT_SEGMENT_MINUTES = 30
+
+# Per audio second while a segment is transcribed: float32 samples, the padded
+# copy and the log-mel spectrogram (~64 + 64 + 32 KB), plus decoded results
+SEGMENT_BYTES_PER_SECOND = 200 * 1024
+
+# Leave headroom for the OS, ffmpeg and everything else on the host
+MEMORY_BUDGET_FRACTION = 0.6
+
+def current_rss_mb():
+    """Resident set size of this process in MB, or None if unavailable"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if os.uname().sysname == "Darwin" else peak / 1024
+    except (ImportError, AttributeError):
+        return None
+
+def available_memory_mb():
+    """Memory available for new processes in MB, or None if unknown"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES") / 1024 / 1024
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def synthetic_speech(seconds=8, sample_rate=16000, seed=0):
+    """Voiced, syllable-like bursts with drifting pitch and a noise floor"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.7 * t) + 10 * rng.standard_normal(t.size).cumsum() / sample_rate
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    audio = 0.3 * voiced * syllables + 0.01 * rng.standard_normal(t.size)
+    return audio.astype(np.float32)
+
+def set_threads(threads):
+    import torch
+    torch.set_num_threads(threads)
+
+def thread_candidates(cores):
+    return sorted({1, 2, 4, max(1, cores // 2), cores} & set(range(1, cores + 1)))
+
+def load_cache(cache_file=AUTOTUNE_FILE):
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def cache_key(model_name, engine_name):
+    return f"{socket.gethostname()}|{model_name}|{engine_name}"
+
+def cached_settings(model_name, engine_name="openai", cache_file=AUTOTUNE_FILE):
+    """Tuned settings for this host and model, or None if not calibrated yet"""
+    settings = load_cache(cache_file).get(cache_key(model_name, engine_name))
+    # Recalibrate if the host changed shape (e.g. VM resized) or the entry
+    # predates separate batch settings
+    if settings and settings.get("cores") == os.cpu_count() and "batch" in settings:
+        return settings
+    return None
+
+def save_settings(model_name, engine_name, settings, cache_file=AUTOTUNE_FILE):
+    cache = load_cache(cache_file)
+    cache[cache_key(model_name, engine_name)] = settings
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_name(cache_file.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, cache_file)
+
+def choose_segment_minutes(model_rss_mb, workers, available_mb):
+    """Longest segment whose audio buffers fit in each worker's memory share"""
+    if available_mb is None or model_rss_mb is None:
+        return DEFAULT_SEGMENT_MINUTES
+    per_worker_mb = available_mb * MEMORY_BUDGET_FRACTION / workers
+    for minutes in SEGMENT_CHOICES:
+        if model_rss_mb + minutes * 60 * SEGMENT_BYTES_PER_SECOND / 1024 / 1024 <= per_worker_mb:
+            return minutes
+    return SEGMENT_CHOICES[-1]
+
+def calibrate(engine, seconds=8, word_timestamps=True, log=print):
+    """
+    Measure real-time factor and memory at several thread counts for a loaded
+    engine; returns the best settings for this host (not yet cached).
+    """
+    import torch
+
+    cores = os.cpu_count() or 1
+    audio = synthetic_speech(seconds)
+    options = dict(language="en", word_timestamps=word_timestamps, verbose=None)
+    original_threads = torch.get_num_threads()
+
+    # Warm-up run so one-time allocations do not count against the first setting
+    engine.transcribe_window(audio[:16000 * 2], **options)
+    model_rss_mb = current_rss_mb()
+
+    measurements = []
+    try:
+        for threads in thread_candidates(cores):
+            set_threads(threads)
+            start = time.perf_counter()
+            engine.transcribe_window(audio, **options)
+            rtf = (time.perf_counter() - start) / seconds
+            rss_mb = current_rss_mb()
+            measurements.append({"threads": threads, "rtf": rtf, "rss_mb": rss_mb})
+            log(f"  threads={threads:<3} RTF {rtf:6.3f}  RSS {rss_mb or 0:7.0f} MB")
+    finally:
+        set_threads(original_threads)
+
+    available_mb = available_memory_mb()
+    peak_rss_mb = max((m["rss_mb"] or 0 for m in measurements), default=0) or model_rss_mb
+
+    # One transcription at a time: lowest real-time factor, keeping fewer
+    # threads unless more are clearly faster
+    single = None
+    for m in measurements:
+        if single is None or m["rtf"] * 1.05 < single["rtf"]:
+            single = m
+
+    # Batch: throughput (audio seconds per wall second) of `workers` processes
+    # with `threads` each, limited by cores and by memory
+    batch = None
+    for m in measurements:
+        max_workers = cores // m["threads"]
+        if available_mb and peak_rss_mb:
+            max_workers = min(max_workers, max(1, math.floor(available_mb * MEMORY_BUDGET_FRACTION / peak_rss_mb)))
+        for workers in range(1, max(1, max_workers) + 1):
+            throughput = workers / m["rtf"]
+            if batch is None or throughput > batch["throughput"] * 1.05:
+                batch = dict(m, workers=workers, throughput=throughput)
+        log(f"  threads={m['threads']:<3} up to {max(1, max_workers)} worker(s)")
+
+    return {
+        "threads": single["threads"],
+        "segment_minutes": choose_segment_minutes(peak_rss_mb, 1, available_mb),
+        "rtf": round(single["rtf"], 4),
+        "batch": {
+            "workers": batch["workers"],
+            "threads": batch["threads"],
+            "segment_minutes": choose_segment_minutes(peak_rss_mb, batch["workers"], available_mb),
+            "throughput": round(batch["throughput"], 3),
+        },
+        "rss_mb": round(peak_rss_mb or 0),
+        "cores": cores,
+        "available_mb": round(available_mb) if available_mb else None,
+        "calibrated": datetime.now().isoformat(),
+        "measurements": measurements,
+    }
+
+def batch_settings(settings, workers=None):
+    """Workers, threads per worker and segment length for a batch of `workers` jobs"""
+    if workers == 1:
+        return {"workers": 1, "threads": settings["threads"], "segment_minutes": settings["segment_minutes"]}
+    batch = settings["batch"]
+    if workers is None or workers == batch["workers"]:
+        return {key: batch[key] for key in ("workers", "threads", "segment_minutes")}
+    return {
+        "workers": workers,
+        "threads": max(1, settings["cores"] // workers),
+        "segment_minutes": choose_segment_minutes(settings["rss_mb"] or None, workers, settings["available_mb"]),
+    }
+
+def tuned_settings(engine, model_name, engine_name="openai", force=False, seconds=8, log=print):
+    """Cached settings for this host and model, calibrating with `engine` if needed"""
+    settings = None if force else cached_settings(model_name, engine_name)
+    if settings is None:
+        log(f"Calibrating {model_name} ({engine_name} engine) on {socket.gethostname()}, {os.cpu_count()} cores...")
+        engine.load()
+        settings = calibrate(engine, seconds=seconds, log=log)
+        save_settings(model_name, engine_name, settings)
+        batch = settings["batch"]
+        log(f"Tuned: {settings['threads']} thread(s) and {settings['segment_minutes']} min segments per "
+            f"transcription; batches of {batch['workers']} worker(s) x {batch['threads']} thread(s) "
+            f"(cached in {AUTOTUNE_FILE})")
+    return settings
@@ -5,6 +5,11 @@
 # Supported formats: mp4, mkv, avi, mov, wmv, flv, webm, m4v, mpg, mpeg
 # Outputs transcription files (.txt, .srt, .json) to the same directory as each video
 # Usage: ./batch_transcribe_video.sh <video_directory>
+# Scheduling (environment variables):
+#   POLICY=sjf|ljf|priority|fifo   job order (default: sjf, shortest first)
+#   WORKERS=N                      concurrent transcriptions (default: host calibration)
+#   NO_AUTOTUNE=1                  do not calibrate or apply tuned settings for this host
+#   PRIORITY_FILE=path             path patterns, highest priority first (POLICY=priority)
 
 set +e  # Continue processing even if individual videos fail
 
@@ -17,6 +22,7 @@ if [ -z "$1" ]; then
 fi
 
 VIDEO_DIR="$1"
+POLICY="${POLICY:-sjf}"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 # Check if directory exists
@@ -29,74 +35,26 @@ cd "$SCRIPT_DIR"
 
 echo "Starting recursive batch transcription..."
 echo "Video directory: $VIDEO_DIR"
-
-# Find all supported video files
-# Common video formats: mp4, mkv, avi, mov, wmv, flv, webm, m4v, mpg, mpeg
-total_videos=$(find "$VIDEO_DIR" -type f \( \
-    -iname "*.mp4" -o \
-    -iname "*.mkv" -o \
-    -iname "*.avi" -o \
-    -iname "*.mov" -o \
-    -iname "*.wmv" -o \
-    -iname "*.flv" -o \
-    -iname "*.webm" -o \
-    -iname "*.m4v" -o \
-    -iname "*.mpg" -o \
-    -iname "*.mpeg" \
-\) | wc -l)
-echo "Found $total_videos video(s) to process"
+echo "Policy: $POLICY | Workers: ${WORKERS:-auto}"
 echo ""
 
-current=0
-succeeded=0
-failed=0
-
-# Process each video file recursively
-find "$VIDEO_DIR" -type f \( \
-    -iname "*.mp4" -o \
-    -iname "*.mkv" -o \
-    -iname "*.avi" -o \
-    -iname "*.mov" -o \
-    -iname "*.wmv" -o \
-    -iname "*.flv" -o \
-    -iname "*.webm" -o \
-    -iname "*.m4v" -o \
-    -iname "*.mpg" -o \
-    -iname "*.mpeg" \
-\) | while IFS= read -r video; do
-    ((current++))
-    video_dir=$(dirname "$video")
-    
-    echo "=========================================="
-    echo "[$current/$total_videos] Processing: $(basename "$video")"
-    echo "Directory: $video_dir"
-    echo "=========================================="
-    
-    # Transcribe with output to same directory as video
-    # Redirect stdin from /dev/null to prevent consuming the pipe
-    (
-        source venv/bin/activate
-        python3 transcription_manager.py transcribe \
-            --video "$video" \
-            --model base \
-            --output "$video_dir" < /dev/null
-    )
-    exit_code=$?
-    
-    if [ $exit_code -eq 0 ]; then
-        echo "✓ Success"
-        ((succeeded++))
-    else
-        echo "✗ Failed with exit code $exit_code"
-        ((failed++))
-    fi
-    
-    echo ""
-done
+# Durations are probed up front and jobs ordered by policy (shortest first by
+# default) so short clips are not stuck behind multi-hour recordings
+PRIORITY_ARGS=()
+if [ -n "$PRIORITY_FILE" ]; then
+    PRIORITY_ARGS=(--priority-file "$PRIORITY_FILE")
+fi
+WORKER_ARGS=()
+if [ -n "$WORKERS" ]; then
+    WORKER_ARGS=(--workers "$WORKERS")
+fi
+if [ -n "$NO_AUTOTUNE" ]; then
+    WORKER_ARGS+=(--no-autotune)
+fi
 
-echo "=========================================="
-echo "Batch transcription complete!"
-echo "Processed: $current videos"
-echo "Succeeded: $succeeded"
-echo "Failed: $failed"
-echo "=========================================="
+source venv/bin/activate
+python3 transcription_manager.py batch "$VIDEO_DIR" \
+    --model base \
+    --policy "$POLICY" \
+    "${WORKER_ARGS[@]}" \
+    "${PRIORITY_ARGS[@]}" < /dev/null
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Transcription Benchmarks
+Tracked performance checks for the transcription tools.
+
+    startup   - import time of the cheap subcommands (python -X importtime)
+    engines   - speed and word error rate of each inference engine on audio fixtures
+    alignment - first-pass speed-up from deferring word-level alignment
+    queue     - several local worker processes sharing a directory through
+                lease files, with simulated transcription; checks that every
+                segment is done exactly once under one layout
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import tempfile
+import subprocess
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPT_DIR.parent
+
+# Commands that must never pay for loading whisper/torch
+STARTUP_COMMANDS = [
+    [str(SCRIPT_DIR / "transcription_manager.py"), "--help"],
+    [str(SCRIPT_DIR / "transcription_manager.py"), "cleanup", "--help"],
+    [str(SCRIPT_DIR / "transcription_manager.py"), "disk-usage", "--help"],
+    [str(REPO_DIR / "speech_to_text" / "whisper_cross_platform.py"), "--help"],
+]
+
+HEAVY_MODULES = ("whisper", "torch", "numpy")
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".flac", ".m4a", ".ogg", ".mp4")
+
+# Simulated video length for the queue benchmark
+SIMULATED_VIDEO_SECONDS = 10 * 60
+
+sys.path.insert(0, str(REPO_DIR / "utils"))
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into {module: cumulative_us} for top-level imports"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _, cumulative_us, name = line.split(":", 1)[1].split("|")
+            cumulative_us = int(cumulative_us)
+        except ValueError:
+            continue
+        # Nested imports are indented; only top-level entries add up to the total
+        if name.startswith("  "):
+            continue
+        modules[name.strip()] = cumulative_us
+    return modules
+
+def measure_startup(command, runs=5):
+    """Run a command repeatedly under -X importtime and collect timings"""
+    wall_ms = []
+    import_ms = []
+    heavy = set()
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime"] + command,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        wall_ms.append((time.perf_counter() - start) * 1000)
+
+        modules = parse_importtime(result.stderr)
+        import_ms.append(sum(modules.values()) / 1000)
+        heavy.update(m for m in modules if m.split(".")[0] in HEAVY_MODULES)
+
+    return {
+        "command": " ".join(Path(command[0]).name if i == 0 else part for i, part in enumerate(command)),
+        "wall_ms": statistics.median(wall_ms),
+        "import_ms": statistics.median(import_ms),
+        "heavy_imports": sorted(heavy),
+    }
+
+def record_results(record_file, benchmark, results):
+    """Append a benchmark run to a JSON-lines history file"""
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "host": socket.gethostname(),
+        "python": sys.version.split()[0],
+        "benchmark": benchmark,
+        "results": results,
+    }
+    with open(record_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    print(f"Results appended to: {record_file}")
+
+def normalize_words(text):
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by the reference length"""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1] / len(ref)
+
+def find_fixtures(fixtures_dir):
+    """Audio files in a directory, each optionally paired with a <name>.txt reference"""
+    fixtures = []
+    for path in sorted(Path(fixtures_dir).iterdir()):
+        if path.suffix.lower() in AUDIO_EXTENSIONS:
+            reference = path.with_suffix(".txt")
+            fixtures.append((path, reference.read_text(encoding="utf-8") if reference.exists() else None))
+    return fixtures
+
+def run_engines(args):
+    import whisper
+    from whisper_engines import create_engine
+
+    fixtures = find_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"No audio fixtures found in {args.fixtures}")
+        return 1
+
+    print("Engine Benchmark")
+    print("=" * 60)
+    print(f"Model: {args.model} | Fixtures: {len(fixtures)} | Engines: {', '.join(args.engines)}")
+    print()
+
+    audio = {path: whisper.load_audio(str(path)) for path, _ in fixtures}
+    audio_seconds = sum(len(samples) for samples in audio.values()) / whisper.audio.SAMPLE_RATE
+
+    results = []
+    for engine_name in args.engines:
+        engine = create_engine(engine_name, args.model, device=args.device)
+        load_start = time.perf_counter()
+        engine.load()
+        load_seconds = time.perf_counter() - load_start
+
+        texts = {}
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            for path, _ in fixtures:
+                texts[path] = engine.transcribe_window(audio[path], language=args.language)["text"]
+            timings.append(time.perf_counter() - start)
+
+        results.append({
+            "engine": engine_name,
+            "device": engine.device,
+            "load_seconds": load_seconds,
+            "transcribe_seconds": statistics.median(timings),
+            "rtf": statistics.median(timings) / audio_seconds,
+            "texts": {str(path): text for path, text in texts.items()},
+        })
+        del engine
+
+    # WER against reference transcripts where present, otherwise against the first engine
+    baseline = results[0]
+    for result in results:
+        errors = []
+        for path, reference in fixtures:
+            reference = reference if reference is not None else baseline["texts"][str(path)]
+            errors.append(word_error_rate(reference, result["texts"][str(path)]))
+        result["wer"] = statistics.mean(errors)
+
+    has_references = all(reference is not None for _, reference in fixtures)
+    print(f"WER measured against {'reference transcripts' if has_references else 'the first engine'}")
+    print(f"  {'engine':<8} {'device':<6} {'load s':>8} {'run s':>8} {'RTF':>7} {'speed-up':>9} {'WER':>7} {'dWER':>7}")
+    for result in results:
+        speedup = baseline["transcribe_seconds"] / result["transcribe_seconds"]
+        print(f"  {result['engine']:<8} {result['device']:<6} {result['load_seconds']:8.1f} "
+              f"{result['transcribe_seconds']:8.1f} {result['rtf']:7.3f} {speedup:8.2f}x "
+              f"{result['wer']:7.3f} {result['wer'] - baseline['wer']:+7.3f}")
+
+    if args.record:
+        for result in results:
+            del result["texts"]
+        record_results(args.record, "engines", {"model": args.model, "audio_seconds": audio_seconds,
+                                                "engines": results})
+    return 0
+
+def run_alignment(args):
+    import whisper
+    from whisper_engines import create_engine
+
+    fixtures = find_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"No audio fixtures found in {args.fixtures}")
+        return 1
+
+    engine = create_engine(args.engine, args.model, device=args.device).load()
+    print("Alignment Benchmark")
+    print("=" * 60)
+    print(f"Model: {args.model} | {engine.describe()} | Fixtures: {len(fixtures)}")
+    print()
+
+    # Untimed warm-up of both modes, so first-call allocations and kernel
+    # caching are not charged to whichever mode happens to run first
+    warmup = whisper.load_audio(str(fixtures[0][0]))[:whisper.audio.SAMPLE_RATE * 10]
+    for word_timestamps in (True, False):
+        engine.transcribe_window(warmup, language=args.language, word_timestamps=word_timestamps)
+
+    totals = {"with_words": 0.0, "without_words": 0.0, "deferred_align": 0.0}
+    audio_seconds = 0.0
+    for index, (path, _) in enumerate(fixtures):
+        audio = whisper.load_audio(str(path))
+        audio_seconds += len(audio) / whisper.audio.SAMPLE_RATE
+
+        # Alternate which mode goes first to cancel out any remaining order effects
+        for word_timestamps in ((True, False) if index % 2 == 0 else (False, True)):
+            start = time.perf_counter()
+            result_for_mode = engine.transcribe_window(audio, language=args.language,
+                                                       word_timestamps=word_timestamps)
+            totals["with_words" if word_timestamps else "without_words"] += time.perf_counter() - start
+            if not word_timestamps:
+                result = result_for_mode
+
+        start = time.perf_counter()
+        engine.align_words(audio, result["segments"], language=args.language)
+        totals["deferred_align"] += time.perf_counter() - start
+
+    speedup = totals["with_words"] / totals["without_words"]
+    print(f"  Audio:                        {audio_seconds:8.1f} s")
+    print(f"  Transcribe with word timings: {totals['with_words']:8.1f} s")
+    print(f"  Transcribe without:           {totals['without_words']:8.1f} s  ({speedup:.2f}x faster first pass)")
+    print(f"  Deferred alignment of all:    {totals['deferred_align']:8.1f} s")
+
+    if args.record:
+        record_results(args.record, "alignment", dict(totals, model=args.model, engine=args.engine,
+                                                      audio_seconds=audio_seconds, speedup=speedup))
+    return 0
+
+def queue_worker(directory, worker_id, segment_minutes, ttl, segment_seconds, crash_after, start_at, log_file):
+    """
+    One simulated worker process: the real run_worker() loop, leases and
+    layout handling, with process_segment() replaced by a sleep
+    """
+    sys.stdout = sys.stderr = open(os.devnull, "w")
+    sys.path.insert(0, str(SCRIPT_DIR))
+    import transcription_manager
+    from json_files import write_json_atomic
+
+    class SimulatedManager(transcription_manager.WhisperTranscriptionManager):
+        processed = 0
+
+        def apply_tuning(self, segment_minutes=None, **kwargs):
+            self.segment_minutes = segment_minutes or self.segment_minutes
+
+        def get_video_duration(self):
+            if self.total_duration is None:
+                time.sleep(0.1)  # ffprobe
+                self.total_duration = SIMULATED_VIDEO_SECONDS
+            return self.total_duration
+
+        def record_throughput(self):
+            pass
+
+        def process_segment(self, segment_num, total_segments, segment_duration, total_duration, lease=None):
+            if crash_after is not None and SimulatedManager.processed >= crash_after:
+                os._exit(1)  # die holding the segment lease, like a killed worker
+            time.sleep(segment_seconds)
+            start = segment_num * segment_duration
+            result = {"text": f"segment {segment_num + 1}",
+                      "segments": [{"start": start, "end": min(start + segment_duration, total_duration),
+                                    "text": f"segment {segment_num + 1}"}]}
+            with open(log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"video": Path(self.source_video).name, "segment": segment_num + 1,
+                                    "segment_minutes": self.segment_minutes, "worker": worker_id}) + "\n")
+            write_json_atomic(self.segment_file(segment_num + 1), result)
+            SimulatedManager.processed += 1
+            return result
+
+    transcription_manager.WhisperTranscriptionManager = SimulatedManager
+    # Start together so the workers race to publish each video's layout
+    time.sleep(max(0.0, start_at - time.time()))
+    transcription_manager.run_worker(directory, segment_minutes=segment_minutes, lease_ttl=ttl,
+                                     poll_seconds=0.2, worker_id=worker_id)
+
+def check_queue_run(directory, videos, log_file):
+    """List of problems found in a finished queue run (empty if correct)"""
+    problems = []
+    processed = {}
+    if log_file.exists():
+        for line in log_file.read_text(encoding="utf-8").splitlines():
+            entry = json.loads(line)
+            processed.setdefault((entry["video"], entry["segment"]), []).append(entry)
+
+    for video in videos:
+        progress_file = video.parent / f".{video.stem}_progress.json"
+        data_file = video.parent / f"{video.stem}_data.json"
+        if not data_file.exists():
+            problems.append(f"{video.name}: not completed")
+            continue
+        layout = json.loads(progress_file.read_text(encoding="utf-8"))["segment_minutes"]
+        expected = -(-SIMULATED_VIDEO_SECONDS // (layout * 60))
+        segments = json.loads(data_file.read_text(encoding="utf-8"))["segments"]
+        if len(segments) != expected:
+            problems.append(f"{video.name}: {len(segments)} segment(s) combined, expected {expected}")
+
+        for number in range(1, expected + 1):
+            entries = processed.get((video.name, number), [])
+            if len(entries) > 1:
+                problems.append(f"{video.name}: segment {number} processed {len(entries)} times "
+                                f"by {', '.join(e['worker'] for e in entries)}")
+            for entry in entries:
+                if entry["segment_minutes"] != layout:
+                    problems.append(f"{video.name}: segment {number} cut at {entry['segment_minutes']} min "
+                                    f"by {entry['worker']}, layout is {layout} min")
+
+    leftovers = [p.name for p in directory.rglob("*.lease")]
+    if leftovers:
+        problems.append(f"lease files left behind: {', '.join(sorted(leftovers))}")
+    return problems
+
+def run_queue(args):
+    directory = Path(tempfile.mkdtemp(prefix="queue_bench_"))
+    videos = []
+    for index in range(args.videos):
+        video = directory / f"video_{index + 1:02d}.mp4"
+        video.touch()
+        videos.append(video)
+    log_file = directory / "processed.jsonl"
+
+    print("Work Queue Benchmark")
+    print("=" * 60)
+    print(f"Workers: {args.workers} | Videos: {args.videos} x {SIMULATED_VIDEO_SECONDS // 60} min | "
+          f"Lease TTL: {args.ttl:.0f} s{' | worker 1 crashes' if args.crash else ''}")
+    print(f"Directory: {directory}")
+    print()
+
+    # Each worker asks for a different segment length; all must follow
+    # whichever layout was published first for a video
+    context = multiprocessing.get_context("spawn")
+    start_at = time.time() + 2.0
+    processes = []
+    for index in range(args.workers):
+        worker_id = f"sim-{index + 1}"
+        process = context.Process(target=queue_worker, args=(
+            str(directory), worker_id, index % 3 + 1, args.ttl, args.segment_seconds,
+            1 if args.crash and index == 0 else None, start_at, log_file))
+        process.start()
+        processes.append(process)
+
+    for process in processes:
+        process.join(args.timeout)
+    wall = time.time() - start_at
+    hung = [p for p in processes if p.is_alive()]
+    for process in hung:
+        process.terminate()
+
+    problems = check_queue_run(directory, videos, log_file)
+    if hung:
+        problems.append(f"{len(hung)} worker(s) still running after {args.timeout:.0f} s")
+
+    per_worker = {}
+    if log_file.exists():
+        for line in log_file.read_text(encoding="utf-8").splitlines():
+            worker = json.loads(line)["worker"]
+            per_worker[worker] = per_worker.get(worker, 0) + 1
+    for index, process in enumerate(processes):
+        worker_id = f"sim-{index + 1}"
+        print(f"  {worker_id:<8} segments {per_worker.get(worker_id, 0):4d}  exit code {process.exitcode}")
+    print(f"\n  Wall time: {wall:.1f} s")
+
+    for problem in problems:
+        print(f"  FAIL: {problem}")
+    if not problems:
+        print("  ok: every segment processed once, under one layout per video")
+
+    if args.record:
+        record_results(args.record, "queue", {"workers": args.workers, "videos": args.videos,
+                                              "crash": args.crash, "wall_seconds": wall,
+                                              "segments_per_worker": per_worker, "problems": problems})
+    return 1 if problems else 0
+
+def run_startup(args):
+    print("Startup Benchmark")
+    print("=" * 60)
+    print(f"Budget: {args.budget_ms:.0f} ms wall clock per command (median of {args.runs})")
+    print()
+
+    results = []
+    failed = False
+
+    for command in STARTUP_COMMANDS:
+        result = measure_startup(command, runs=args.runs)
+        over_budget = result["wall_ms"] > args.budget_ms or result["heavy_imports"]
+        failed = failed or over_budget
+        results.append(result)
+
+        status = "FAIL" if over_budget else "ok"
+        print(f"  [{status:>4}] {result['command']:<45} "
+              f"wall {result['wall_ms']:6.1f} ms | imports {result['import_ms']:6.1f} ms")
+        if result["heavy_imports"]:
+            print(f"         heavy imports: {', '.join(result['heavy_imports'])}")
+
+    if args.record:
+        record_results(args.record, "startup", results)
+
+    return 1 if failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcription benchmarks')
+    parser.add_argument('--record', help='Append results to this JSON-lines file')
+    subparsers = parser.add_subparsers(dest='command', help='Available benchmarks')
+
+    p_startup = subparsers.add_parser('startup', help='Measure startup/import time of cheap subcommands')
+    p_startup.add_argument('--runs', type=int, default=5, help='Runs per command (default: 5)')
+    p_startup.add_argument('--budget-ms', type=float, default=100.0,
+                           help='Fail if median wall time exceeds this (default: 100)')
+
+    p_engines = subparsers.add_parser('engines', help='Compare inference engines on audio fixtures')
+    p_engines.add_argument('--fixtures', required=True,
+                           help='Directory of audio files, optionally with <name>.txt reference transcripts')
+    p_engines.add_argument('--model', default='base', help='Whisper model size (default: base)')
+    p_engines.add_argument('--engines', nargs='+', default=['openai', 'int8'],
+                           help='Engines to compare; the first is the baseline (default: openai int8)')
+    p_engines.add_argument('--device', default='cpu',
+                           help='Device for all engines so timings are comparable (default: cpu)')
+    p_engines.add_argument('--language', default='en', help='Transcription language (default: en)')
+    p_engines.add_argument('--runs', type=int, default=1, help='Timed runs per engine (default: 1)')
+
+    p_alignment = subparsers.add_parser('alignment', help='Measure the cost of word-level alignment')
+    p_alignment.add_argument('--fixtures', required=True, help='Directory of audio files')
+    p_alignment.add_argument('--model', default='base', help='Whisper model size (default: base)')
+    p_alignment.add_argument('--engine', default='openai', help='Inference engine (default: openai)')
+    p_alignment.add_argument('--device', default='cpu', help='Device (default: cpu)')
+    p_alignment.add_argument('--language', default='en', help='Transcription language (default: en)')
+
+    p_queue = subparsers.add_parser('queue', help='Run local workers against a shared work queue')
+    p_queue.add_argument('--workers', type=int, default=4, help='Worker processes (default: 4)')
+    p_queue.add_argument('--videos', type=int, default=3, help='Simulated videos (default: 3)')
+    p_queue.add_argument('--segment-seconds', type=float, default=0.2,
+                         help='Simulated transcription time per segment (default: 0.2)')
+    p_queue.add_argument('--ttl', type=float, default=3.0, help='Lease TTL in seconds (default: 3)')
+    p_queue.add_argument('--crash', action='store_true',
+                         help='Kill the first worker while it holds a lease, to exercise reclaiming')
+    p_queue.add_argument('--timeout', type=float, default=120.0,
+                         help='Fail if the workers have not finished after this many seconds (default: 120)')
+
+    args = parser.parse_args()
+
+    if args.command == 'startup':
+        sys.exit(run_startup(args))
+    elif args.command == 'engines':
+        sys.exit(run_engines(args))
+    elif args.command == 'alignment':
+        sys.exit(run_alignment(args))
+    elif args.command == 'queue':
+        sys.exit(run_queue(args))
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
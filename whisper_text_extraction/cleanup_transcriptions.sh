@@ -3,6 +3,7 @@
 # Clean up transcription artifacts recursively
 # Removes all files created by batch_transcribe_video.sh
 # Usage: ./cleanup_transcriptions.sh <directory>
+# Pass --dry-run as the second argument to only count artifacts
 
 set +e  # Continue even if some files don't exist
 
@@ -14,6 +15,7 @@ if [ -z "$1" ]; then
 fi
 
 TARGET_DIR="$1"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 if [ ! -d "$TARGET_DIR" ]; then
     echo "Error: Directory does not exist: $TARGET_DIR"
@@ -31,8 +33,14 @@ echo "  - .*_segments/ (hidden segment directories)"
 echo "  - transcription_progress.json (legacy progress files)"
 echo "  - segments/ (legacy segment directories)"
 echo "  - transcription.log"
+echo "  - temp_segment_*.wav, *.tmp (temporary files)"
 echo ""
 
+if [ "$2" == "--dry-run" ]; then
+    python3 "$SCRIPT_DIR/transcription_manager.py" cleanup "$TARGET_DIR" --categories all --dry-run
+    exit $?
+fi
+
 read -p "Continue? (y/N): " -n 1 -r
 echo
 if [[ ! $REPLY =~ ^[Yy]$ ]]; then
@@ -42,87 +50,8 @@ fi
 
 echo ""
 echo "Removing transcription artifacts..."
-
-# Count files before deletion
-transcript_count=$(find "$TARGET_DIR" -type f -name "*_transcript.txt" 2>/dev/null | wc -l)
-srt_count=$(find "$TARGET_DIR" -type f -name "*_subtitles.srt" 2>/dev/null | wc -l)
-json_count=$(find "$TARGET_DIR" -type f -name "*_data.json" 2>/dev/null | wc -l)
-progress_count=$(find "$TARGET_DIR" -type f -name ".*_progress.json" 2>/dev/null | wc -l)
-segment_count=$(find "$TARGET_DIR" -type d -name ".*_segments" 2>/dev/null | wc -l)
-legacy_progress_count=$(find "$TARGET_DIR" -type f -name "transcription_progress.json" 2>/dev/null | wc -l)
-legacy_segment_count=$(find "$TARGET_DIR" -type d -name "segments" 2>/dev/null | wc -l)
-log_count=$(find "$TARGET_DIR" -type f -name "transcription.log" 2>/dev/null | wc -l)
-
-total_files=$((transcript_count + srt_count + json_count + progress_count + legacy_progress_count + log_count))
-total_items=$((total_files + segment_count + legacy_segment_count))
-
-if [ $total_items -eq 0 ]; then
-    echo "No transcription artifacts found"
-    exit 0
-fi
-
-echo "Found:"
-echo "  Transcript files:     $transcript_count"
-echo "  Subtitle files:       $srt_count"
-echo "  JSON data files:      $json_count"
-echo "  Progress files:       $progress_count"
-echo "  Segment directories:  $segment_count"
-echo "  Legacy progress:      $legacy_progress_count"
-echo "  Legacy segments:      $legacy_segment_count"
-echo "  Log files:            $log_count"
-echo "  Total items:          $total_items"
 echo ""
 
-# Remove transcript files
-if [ $transcript_count -gt 0 ]; then
-    echo "Removing transcript files..."
-    find "$TARGET_DIR" -type f -name "*_transcript.txt" -delete
-fi
-
-# Remove subtitle files
-if [ $srt_count -gt 0 ]; then
-    echo "Removing subtitle files..."
-    find "$TARGET_DIR" -type f -name "*_subtitles.srt" -delete
-fi
-
-# Remove JSON data files
-if [ $json_count -gt 0 ]; then
-    echo "Removing JSON data files..."
-    find "$TARGET_DIR" -type f -name "*_data.json" -delete
-fi
-
-# Remove progress files (hidden)
-if [ $progress_count -gt 0 ]; then
-    echo "Removing progress files..."
-    find "$TARGET_DIR" -type f -name ".*_progress.json" -delete
-fi
-
-# Remove segment directories (hidden)
-if [ $segment_count -gt 0 ]; then
-    echo "Removing segment directories..."
-    find "$TARGET_DIR" -type d -name ".*_segments" -exec rm -rf {} + 2>/dev/null
-fi
-
-# Remove legacy progress files
-if [ $legacy_progress_count -gt 0 ]; then
-    echo "Removing legacy progress files..."
-    find "$TARGET_DIR" -type f -name "transcription_progress.json" -delete
-fi
-
-# Remove legacy segment directories
-if [ $legacy_segment_count -gt 0 ]; then
-    echo "Removing legacy segment directories..."
-    find "$TARGET_DIR" -type d -name "segments" -exec rm -rf {} + 2>/dev/null
-fi
-
-# Remove log files
-if [ $log_count -gt 0 ]; then
-    echo "Removing log files..."
-    find "$TARGET_DIR" -type f -name "transcription.log" -delete
-fi
-
-echo ""
-echo "=========================================="
-echo "Cleanup complete!"
-echo "Removed $total_items items"
-echo "=========================================="
+# Single parallel pass over the tree: classifies, counts and deletes every
+# artifact category at once instead of running find once per pattern
+python3 "$SCRIPT_DIR/transcription_manager.py" cleanup "$TARGET_DIR" --categories all --yes
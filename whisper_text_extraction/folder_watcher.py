@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Watch-Folder Ingestion
+Detects new or changed videos below a directory tree without rescanning it.
+
+Uses inotify (through the optional `watchdog` package) when available. On network
+mounts, where inotify sees nothing, a polling watcher stats each known directory
+and only re-lists the ones whose mtime changed. Either way a file is only handed
+on once its size and mtime have stopped changing for `settle_seconds`.
+"""
+
+import os
+import time
+import threading
+
+from tree_scanner import is_video, classify
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+def outputs_current(video_path):
+    """True if the video's final outputs exist and are newer than the video"""
+    directory, filename = os.path.split(video_path)
+    stem = os.path.splitext(filename)[0]
+    try:
+        return os.stat(os.path.join(directory, f"{stem}_data.json")).st_mtime >= \
+            os.stat(video_path).st_mtime
+    except OSError:
+        return False
+
+class StabilityTracker:
+    """Holds candidate files until they stop growing"""
+
+    def __init__(self, settle_seconds=30):
+        self.settle_seconds = settle_seconds
+        self._pending = {}  # path -> (size, mtime, unchanged since)
+        self._lock = threading.Lock()
+
+    def add(self, path):
+        with self._lock:
+            self._pending.setdefault(path, (None, None, time.monotonic()))
+
+    def __len__(self):
+        return len(self._pending)
+
+    def pop_stable(self):
+        """Return files whose size/mtime have not changed for settle_seconds"""
+        now = time.monotonic()
+        stable = []
+        with self._lock:
+            for path, (size, mtime, since) in list(self._pending.items()):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    del self._pending[path]  # deleted or moved away
+                    continue
+                if (st.st_size, st.st_mtime) != (size, mtime):
+                    self._pending[path] = (st.st_size, st.st_mtime, now)
+                elif st.st_size > 0 and now - since >= self.settle_seconds:
+                    stable.append(path)
+                    del self._pending[path]
+        return stable
+
+class PollingWatcher:
+    """
+    Incremental poller: one full listing at start, then only directories whose
+    mtime changed are listed again (creating, deleting or renaming an entry
+    updates the parent directory's mtime).
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._dir_mtimes = {}
+        self._files = {}  # video path -> mtime when last reported
+
+    def _list_directory(self, path, changed, recurse):
+        try:
+            self._dir_mtimes[path] = os.stat(path).st_mtime
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            self._dir_mtimes.pop(path, None)
+            return
+
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    # Only hidden per-video segment directories are skipped;
+                    # plain segments/ folders may hold videos of their own
+                    if classify(entry.name, True) != "segments" and entry.path not in self._dir_mtimes:
+                        if recurse:
+                            self._list_directory(entry.path, changed, recurse)
+                        else:
+                            self._dir_mtimes[entry.path] = None  # new directory, list on next check
+                elif is_video(entry.name):
+                    mtime = entry.stat(follow_symlinks=False).st_mtime
+                    if self._files.get(entry.path) != mtime:
+                        self._files[entry.path] = mtime
+                        changed.append(entry.path)
+            except OSError:
+                continue
+
+    def initial_scan(self):
+        """List the whole tree once; returns all videos found"""
+        changed = []
+        self._list_directory(self.root, changed, recurse=True)
+        return changed
+
+    def check(self):
+        """Return videos that appeared in directories changed since the last check"""
+        changed = []
+        for path, known_mtime in list(self._dir_mtimes.items()):
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                # Directory removed: forget it and everything below it
+                prefix = path + os.sep
+                for other in [d for d in self._dir_mtimes if d == path or d.startswith(prefix)]:
+                    del self._dir_mtimes[other]
+                for video in [v for v in self._files if v.startswith(prefix)]:
+                    del self._files[video]
+                continue
+            if mtime != known_mtime:
+                self._list_directory(path, changed, recurse=known_mtime is None)
+        return changed
+
+class _VideoEventHandler(FileSystemEventHandler):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for path in (getattr(event, "dest_path", None), event.src_path):
+            if path and is_video(os.path.basename(path)):
+                self.callback(os.path.abspath(path))
+
+class FolderWatcher:
+    """Feeds settled new/changed videos to a callback until stopped"""
+
+    def __init__(self, root, on_video, settle_seconds=30, poll_interval=10, force_polling=False):
+        self.root = os.path.abspath(root)
+        self.on_video = on_video
+        self.poll_interval = poll_interval
+        self.tracker = StabilityTracker(settle_seconds)
+        self.use_inotify = Observer is not None and not force_polling
+        self.poller = PollingWatcher(self.root)
+        self._stop = threading.Event()
+        self._observer = None
+
+    @property
+    def mode(self):
+        return "inotify (watchdog)" if self.use_inotify else "polling"
+
+    def _candidate(self, path):
+        if not outputs_current(path):
+            self.tracker.add(path)
+
+    def run(self):
+        for path in self.poller.initial_scan():
+            self._candidate(path)
+
+        if self.use_inotify:
+            self._observer = Observer()
+            self._observer.schedule(_VideoEventHandler(self._candidate), self.root, recursive=True)
+            self._observer.start()
+
+        try:
+            while not self._stop.wait(self.poll_interval):
+                if not self.use_inotify:
+                    for path in self.poller.check():
+                        self._candidate(path)
+                for path in self.tracker.pop_stable():
+                    if not outputs_current(path):
+                        self.on_video(path)
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+JSON Files
+Atomic writes for progress, segment and lease files that several processes
+(or hosts, over a shared directory) read and write concurrently.
+"""
+
+import os
+import json
+from pathlib import Path
+
+def write_json_atomic(path, data):
+    """Write JSON via a temporary file and rename, so readers never see partial data"""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.urandom(4).hex()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def create_json_exclusive(path, data):
+    """Create path with JSON content only if it does not exist; returns True if created"""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.urandom(4).hex()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    try:
+        os.link(tmp, path)  # atomic, fails if path exists (also on NFS)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        os.unlink(tmp)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Batch Scheduler
+Duration-aware ordering of batch transcription jobs.
+
+Durations are read from container headers with ffprobe (no decoding), then jobs
+are ordered by policy:
+
+    sjf       - shortest job first: best median turnaround for waiting users
+    ljf       - longest job first: best makespan when spread over several workers
+    priority  - order given by a priority file, remaining jobs shortest first
+    fifo      - discovery order (previous behaviour)
+"""
+
+import os
+import re
+import fnmatch
+import heapq
+import statistics
+import subprocess
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+POLICIES = ("sjf", "ljf", "priority", "fifo")
+
+# Fallback real-time factors (processing seconds per audio second) when there is
+# no measured history; taken from the "Expected Performance" table in README.md
+DEFAULT_RTF = {"tiny": 0.14, "base": 0.2, "small": 0.28, "medium": 0.4, "large": 0.63}
+
+@dataclass
+class Job:
+    path: str
+    duration: float = None
+    priority: int = None
+    predicted_start: float = None
+    predicted_finish: float = None
+    actual_finish: float = None
+    returncode: int = None
+
+def probe_duration(path):
+    """Media duration in seconds from the container header, or None"""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", str(path)],
+            capture_output=True, text=True, timeout=60
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return float(result.stdout.strip())
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        pass
+
+    # Without ffprobe, `ffmpeg -i` with no output still prints the header duration
+    try:
+        result = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(path)],
+                                capture_output=True, text=True, timeout=60)
+        match = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+        if match:
+            hours, minutes, seconds = match.groups()
+            return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    return None
+
+def probe_durations(paths, workers=8):
+    """Probe many files concurrently; returns {path: duration or None}"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(probe_duration, paths)))
+
+def load_priority_file(priority_file):
+    """Read path patterns (one per line, highest priority first); '#' starts a comment"""
+    patterns = []
+    with open(priority_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                patterns.append(line)
+    return patterns
+
+def match_priority(path, patterns):
+    """Index of the first matching pattern (substring or glob), or None"""
+    normalized = path.replace("\\", "/")
+    for index, pattern in enumerate(patterns):
+        pattern = pattern.replace("\\", "/")
+        if pattern in normalized or fnmatch.fnmatch(normalized, pattern) \
+                or fnmatch.fnmatch(os.path.basename(normalized), pattern):
+            return index
+    return None
+
+def order_jobs(jobs, policy="sjf", priority_patterns=None):
+    """Return jobs in execution order; unknown durations go last"""
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown scheduling policy: {policy}")
+
+    known = [job for job in jobs if job.duration is not None]
+    unknown = [job for job in jobs if job.duration is None]
+
+    if policy == "sjf":
+        known.sort(key=lambda job: job.duration)
+    elif policy == "ljf":
+        known.sort(key=lambda job: -job.duration)
+    elif policy == "priority":
+        for job in jobs:
+            job.priority = match_priority(job.path, priority_patterns or [])
+        known = jobs
+        unknown = []
+        known.sort(key=lambda job: (job.priority is None,
+                                    job.priority if job.priority is not None else 0,
+                                    job.duration is None,
+                                    job.duration or 0))
+    return known + unknown
+
+def predict_schedule(jobs, workers=1, rtf=DEFAULT_RTF["base"], fallback_duration=3600):
+    """
+    Fill in predicted start/finish offsets (seconds from batch start) by list
+    scheduling the ordered jobs onto the earliest free worker.
+    """
+    free_at = [0.0] * max(1, workers)
+    heapq.heapify(free_at)
+    for job in jobs:
+        start = heapq.heappop(free_at)
+        runtime = (job.duration if job.duration is not None else fallback_duration) * rtf
+        job.predicted_start = start
+        job.predicted_finish = start + runtime
+        heapq.heappush(free_at, job.predicted_finish)
+    return jobs
+
+def summarize(jobs):
+    """Median/mean turnaround and makespan, predicted and actual"""
+    summary = {}
+    for key in ("predicted_finish", "actual_finish"):
+        values = [getattr(job, key) for job in jobs if getattr(job, key) is not None]
+        if values:
+            summary[key] = {
+                "median": statistics.median(values),
+                "mean": statistics.mean(values),
+                "makespan": max(values),
+            }
+    return summary
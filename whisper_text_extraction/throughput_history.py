@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Throughput History
+Local store of measured transcription throughput, used to predict run times.
+
+Every completed run appends one JSON line: model, engine, host, cores, audio
+seconds, processing seconds, real-time factor (processing / audio) and speech
+ratio (share of the audio covered by transcribed segments). Predictions use the
+audio-weighted real-time factor of comparable past runs and fall back to the
+README estimates when there is no history yet.
+
+Runs are comparable when they used the same model, engine, cascade model and
+window cache setting; among those, runs on this host at the same thread count
+are preferred. Speech ratio is recorded but not used for prediction: a video's
+ratio is only known once it has been transcribed, and the audio-weighted mean
+already reflects the usual mix of speech and silence.
+"""
+
+import os
+import json
+import socket
+from datetime import datetime
+from pathlib import Path
+
+from scheduler import DEFAULT_RTF
+
+STATE_DIR = Path(os.environ.get("WHISPER_TRANSCRIPTION_HOME", Path.home() / ".whisper_transcription"))
+HISTORY_FILE = STATE_DIR / "throughput_history.jsonl"
+
+# Only the most recent runs matter once hardware or software changes
+MAX_RECORDS_USED = 50
+
+def record_run(model, engine, audio_seconds, processing_seconds, speech_seconds=None,
+               history_file=HISTORY_FILE, **extra):
+    """Append one run's throughput to the history store"""
+    if audio_seconds <= 0:
+        return None
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "host": socket.gethostname(),
+        "cores": os.cpu_count(),
+        "model": model,
+        "engine": engine,
+        "audio_seconds": round(audio_seconds, 2),
+        "processing_seconds": round(processing_seconds, 2),
+        "rtf": processing_seconds / audio_seconds,
+        "speech_ratio": None if speech_seconds is None else min(1.0, speech_seconds / audio_seconds),
+    }
+    entry.update(extra)
+    Path(history_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(history_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+def load_history(history_file=HISTORY_FILE):
+    records = []
+    try:
+        with open(history_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+class RuntimePredictor:
+    """Predicts processing time from audio duration using past throughput"""
+
+    def __init__(self, history_file=HISTORY_FILE):
+        self.records = load_history(history_file)
+
+    def _matching(self, model, engine, cascade=None, window_cache=False, threads=None):
+        host = socket.gethostname()
+        cores = os.cpu_count()
+        # Cascade runs transcribe most audio with a faster model and window
+        # cache runs skip repeated audio, so neither is comparable to plain runs
+        matching = [r for r in self.records
+                    if r.get("model") == model and r.get("engine", "openai") == engine
+                    and r.get("cascade") == cascade
+                    and (r.get("window_hit_rate") is not None) == window_cache]
+
+        # Prefer this host at the same thread count (None is torch's default,
+        # one per core), then this host, then hosts with the same core count,
+        # then anything
+        for subset in ([r for r in matching if r.get("host") == host
+                        and (r.get("threads") or r.get("cores")) == (threads or cores)],
+                       [r for r in matching if r.get("host") == host],
+                       [r for r in matching if r.get("cores") == cores],
+                       matching):
+            if subset:
+                return subset[-MAX_RECORDS_USED:]
+        return []
+
+    def rtf(self, model, engine="openai", cascade=None, window_cache=False, threads=None):
+        """Return (real_time_factor, description of where it came from)"""
+        records = self._matching(model, engine, cascade, window_cache, threads)
+        if records:
+            # Weight each run by its audio length so short test clips do not dominate
+            total_audio = sum(r["audio_seconds"] for r in records)
+            weighted = sum(r["rtf"] * r["audio_seconds"] for r in records) / total_audio
+            return weighted, f"history ({len(records)} run(s))"
+        return DEFAULT_RTF.get(model, DEFAULT_RTF["base"]), "default estimate"
+
+    def predict_seconds(self, audio_seconds, model, engine="openai", **mode):
+        rtf, _ = self.rtf(model, engine, **mode)
+        return audio_seconds * rtf
@@ -2,27 +2,42 @@
 """
 Whisper Text Extraction System
 Complete video-to-text transcription with progress tracking and resume capability.
+
+Heavy dependencies (whisper, and through it torch) are imported lazily when a
+model is first needed, so cleanup, disk-usage and --help start instantly. The
+sibling modules only some subcommands need (scheduler, watcher, work queue,
+autotune, history, window cache) are imported by the functions that use them.
 """
 
-import whisper
 import os
 import time
 import json
-import glob
+import sys
 import subprocess
+import threading
+import queue
 from datetime import datetime, timedelta
 from pathlib import Path
 import argparse
 import logging
-import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+from whisper_engines import ENGINES, create_engine
+from json_files import write_json_atomic, create_json_exclusive
+from tree_scanner import CATEGORY_GROUPS, CATEGORY_LABELS, expand_categories, scan_tree, find_videos, print_scan_summary
+
+# Whisper's own fallback thresholds; a segment crossing any of them is escalated
+DEFAULT_ESCALATION_THRESHOLDS = {"logprob": -1.0, "no_speech": 0.6, "compression_ratio": 2.4}
 
 class WhisperTranscriptionManager:
     """Manages complete video transcription with progress tracking"""
     
-    def __init__(self, source_video, output_dir="transcripts", model_name="base"):
+    def __init__(self, source_video, output_dir="transcripts", model_name="base", engine_name="openai"):
         self.source_video = source_video
         self.output_dir = Path(output_dir)
         self.model_name = model_name
+        self.engine_name = engine_name
         
         # Generate base filename from source video
         video_name = Path(source_video).stem
@@ -33,10 +48,28 @@ class WhisperTranscriptionManager:
         self.total_duration = None
         self.processed_duration = 0
         self.start_time = None
-        self.model = None
+        self.engine = None
         self.segment_minutes = 30
+        self.threads = None  # torch intra-op threads; None leaves torch's default
         self.max_retries = 3
         
+        # Word timings need an extra cross-attention alignment pass per window;
+        # with deferred alignment they are added later by align_words()
+        self.word_timestamps = True
+        
+        # Cascade mode: transcribe with a fast model first and re-transcribe only
+        # low-confidence segments with model_name
+        self.cascade_model_name = None
+        self.cascade_engine = None
+        self.escalation_thresholds = dict(DEFAULT_ESCALATION_THRESHOLDS)
+        
+        # Reuse transcripts of audio windows already seen in other videos
+        # (intros, disclaimers); see enable_window_cache()
+        self.window_cache = None
+        self.run_stats = {"audio_seconds": 0.0, "processing_seconds": 0.0, "wall_seconds": 0.0,
+                          "speech_seconds": 0.0, "escalated_seconds": 0.0,
+                          "segments": 0, "escalated_segments": 0}
+        
         # Make progress tracking video-specific to avoid conflicts
         self.progress_file = self.output_dir / f".{video_name}_progress.json"
         self.final_transcript = self.output_dir / f"{video_name}_transcript.txt"
@@ -58,32 +91,58 @@ class WhisperTranscriptionManager:
         self.logger = logging.getLogger(__name__)
     
     def load_whisper_model(self):
-        if self.model is None:
-            self.logger.info(f"Loading Whisper model: {self.model_name}")
-            self.model = whisper.load_model(self.model_name)
-            self.logger.info("Whisper model loaded successfully")
+        if self.engine is None:
+            self.logger.info(f"Loading Whisper model: {self.model_name} ({self.engine_name} engine)")
+            self.engine = create_engine(self.engine_name, self.model_name).load()
+            self.logger.info(f"Whisper model loaded successfully: {self.engine.describe()}")
+    
+    def apply_tuning(self, segment_minutes=None, threads=None, autotune=True):
+        """
+        Use this host's calibrated settings for whatever was not given explicitly,
+        calibrating (once per host and model) if nothing is cached yet.
+        """
+        from autotune import set_threads, tuned_settings
+        
+        settings = {}
+        if autotune and (segment_minutes is None or threads is None):
+            self.load_whisper_model()
+            settings = tuned_settings(self.engine, self.model_name, self.engine_name,
+                                      log=self.logger.info)
+        self.segment_minutes = segment_minutes or settings.get("segment_minutes", self.segment_minutes)
+        self.threads = threads or settings.get("threads")
+        if self.threads:
+            set_threads(self.threads)
+    
+    def enable_window_cache(self):
+        """Memoize windows per model configuration, shared by every video on this host"""
+        from audio_window_cache import WindowCache
+        
+        namespace = f"{self.model_name}-{self.engine_name}-en"
+        if self.cascade_model_name:
+            namespace += f"-cascade-{self.cascade_model_name}"
+        self.window_cache = WindowCache(namespace)
+    
+    def load_cascade_model(self):
+        if self.cascade_engine is None:
+            self.logger.info(f"Loading cascade first-pass model: {self.cascade_model_name}")
+            self.cascade_engine = create_engine(self.engine_name, self.cascade_model_name).load()
+            self.logger.info("Cascade model loaded successfully")
     
     def get_video_duration(self):
+        from scheduler import probe_duration
+        
         if self.total_duration is not None:
             return self.total_duration
             
         try:
-            cmd = ["ffmpeg", "-i", str(self.source_video), "-f", "null", "-"]
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            # Header probe; decoding the whole file just to learn its length took minutes
+            duration = probe_duration(self.source_video)
+            if duration is None:
+                raise ValueError("Could not determine video duration with ffprobe/ffmpeg")
             
-            for line in result.stdout.split("\n"):
-                if "Duration:" in line:
-                    duration_str = line.split("Duration:")[1].split(",")[0].strip()
-                    parts = duration_str.split(":")
-                    hours = int(parts[0])
-                    minutes = int(parts[1])
-                    seconds = float(parts[2])
-                    
-                    self.total_duration = hours * 3600 + minutes * 60 + seconds
-                    self.logger.info(f"Video duration: {duration_str} ({self.total_duration:.1f} seconds)")
-                    return self.total_duration
-            
-            raise ValueError("Could not parse video duration from FFmpeg output")
+            self.total_duration = duration
+            self.logger.info(f"Video duration: {timedelta(seconds=int(duration))} ({duration:.1f} seconds)")
+            return self.total_duration
             
         except Exception as e:
             self.logger.error(f"Error getting video duration: {e}")
@@ -117,33 +176,132 @@ class WhisperTranscriptionManager:
         minutes, seconds = divmod(remainder, 60)
         return f"{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}".replace(".", ",")
     
-    def transcribe_segment(self, audio_file, segment_start_time):
+    def shift_segments(self, segments, offset):
+        for segment in segments:
+            segment["start"] += offset
+            segment["end"] += offset
+            if "words" in segment:
+                for word in segment["words"]:
+                    word["start"] += offset
+                    word["end"] += offset
+        return segments
+    
+    def needs_escalation(self, segment):
+        thresholds = self.escalation_thresholds
+        return (segment.get("avg_logprob", 0.0) < thresholds["logprob"]
+                or segment.get("no_speech_prob", 0.0) > thresholds["no_speech"]
+                or segment.get("compression_ratio", 0.0) > thresholds["compression_ratio"])
+    
+    def escalation_spans(self, segments, padding=0.5, merge_gap=1.0):
+        """Group consecutive weak segments into (first_index, last_index, start, end) spans"""
+        spans = []
+        for index, segment in enumerate(segments):
+            if not self.needs_escalation(segment):
+                continue
+            start = max(0.0, segment["start"] - padding)
+            end = segment["end"] + padding
+            if spans and (index == spans[-1][1] + 1 or start - spans[-1][3] <= merge_gap):
+                first, _, span_start, _ = spans[-1]
+                spans[-1] = (first, index, span_start, end)
+            else:
+                spans.append((index, index, start, end))
+        return spans
+    
+    def transcribe_cascade(self, audio, **options):
+        """Fast model over the whole window (file or array); the main model only for weak segments"""
+        import whisper
+        
+        if isinstance(audio, (str, Path)):
+            audio = whisper.load_audio(str(audio))
+        sample_rate = whisper.audio.SAMPLE_RATE
+        window_seconds = len(audio) / sample_rate
+        
+        result = self.cascade_engine.transcribe_window(audio, **options)
+        segments = result["segments"]
+        spans = self.escalation_spans(segments)
+        
+        merged = []
+        previous = 0
+        for first, last, start, end in spans:
+            end = min(end, window_seconds)
+            merged.extend(segments[previous:first])
+            previous = last + 1
+            
+            clip = audio[int(start * sample_rate):int(end * sample_rate)]
+            strong = self.shift_segments(self.engine.transcribe_window(clip, **options)["segments"], start)
+            
+            # Drop segments that only exist because of the padding around the span
+            span_start, span_end = segments[first]["start"], segments[last]["end"]
+            merged.extend(segment for segment in strong
+                          if span_start <= (segment["start"] + segment["end"]) / 2 <= span_end)
+            
+            self.run_stats["escalated_seconds"] += end - start
+            self.run_stats["escalated_segments"] += last - first + 1
+        merged.extend(segments[previous:])
+        
+        for index, segment in enumerate(merged):
+            segment["id"] = index
+        
+        self.run_stats["segments"] += len(segments)
+        self.logger.info(f"Cascade: escalated {len(spans)} span(s), "
+                         f"{sum(last - first + 1 for first, last, _, _ in spans)}/{len(segments)} segments")
+        
+        result["segments"] = merged
+        result["text"] = "".join(segment["text"] for segment in merged)
+        return result
+    
+    def transcribe_segment(self, audio_file, segment_start_time, segment_duration=None):
+        if self.cascade_model_name:
+            self.load_cascade_model()
         self.load_whisper_model()
         
         try:
             self.logger.info(f"Transcribing segment: {audio_file}")
+            options = dict(verbose=False, word_timestamps=self.word_timestamps, language="en")
+            started = time.time()
             
-            result = self.model.transcribe(
-                str(audio_file),
-                verbose=False,
-                word_timestamps=True,
-                language="en"
-            )
+            if self.window_cache is not None:
+                import whisper
+                if self.cascade_model_name:
+                    transcribe = lambda clip: self.transcribe_cascade(clip, **options)
+                else:
+                    transcribe = lambda clip: self.engine.transcribe_window(clip, **options)
+                result = self.window_cache.transcribe(whisper.load_audio(str(audio_file)), transcribe,
+                                                      word_timestamps=self.word_timestamps)
+            elif self.cascade_model_name:
+                result = self.transcribe_cascade(audio_file, **options)
+            else:
+                result = self.engine.transcribe_window(str(audio_file), **options)
             
-            for segment in result["segments"]:
-                segment["start"] += segment_start_time
-                segment["end"] += segment_start_time
-                if "words" in segment:
-                    for word in segment["words"]:
-                        word["start"] += segment_start_time
-                        word["end"] += segment_start_time
+            self.run_stats["processing_seconds"] += time.time() - started
+            if segment_duration is None and result["segments"]:
+                segment_duration = result["segments"][-1]["end"]
+            self.run_stats["audio_seconds"] += segment_duration or 0.0
+            self.run_stats["speech_seconds"] += sum(
+                segment["end"] - segment["start"] for segment in result["segments"])
             
+            self.shift_segments(result["segments"], segment_start_time)
             return result
             
         except Exception as e:
             self.logger.error(f"Error transcribing segment {audio_file}: {e}")
             return None
     
+    def log_run_stats(self):
+        stats = self.run_stats
+        if not stats["audio_seconds"]:
+            return
+        rtf = stats["processing_seconds"] / stats["audio_seconds"]
+        self.logger.info(f"Effective real-time factor: {rtf:.3f} "
+                         f"({stats['processing_seconds']:.0f}s for {stats['audio_seconds']:.0f}s of audio)")
+        if self.cascade_model_name:
+            escalated = stats["escalated_seconds"] / stats["audio_seconds"] * 100
+            self.logger.info(f"Cascade {self.cascade_model_name} -> {self.model_name}: "
+                             f"escalated {escalated:.1f}% of audio, "
+                             f"{stats['escalated_segments']}/{stats['segments']} segments")
+        if self.window_cache is not None:
+            self.logger.info(self.window_cache.summary())
+    
     def save_progress(self, processed_segments, current_segment=None):
         progress_data = {
             "timestamp": datetime.now().isoformat(),
@@ -154,8 +312,7 @@ class WhisperTranscriptionManager:
         }
         
         try:
-            with open(self.progress_file, "w") as f:
-                json.dump(progress_data, f, indent=2)
+            write_json_atomic(self.progress_file, progress_data)
         except Exception as e:
             self.logger.error(f"Error saving progress: {e}")
     
@@ -177,24 +334,52 @@ class WhisperTranscriptionManager:
             self.logger.error(f"Error loading progress: {e}")
             return [], 0
     
-    def update_progress_display(self, current_segment, total_segments, segment_duration):
+    def predicted_rtf(self):
+        """Wall seconds per audio second: measured in this run once available, else from history"""
+        from throughput_history import RuntimePredictor
+        
+        if self.run_stats["audio_seconds"] > 0:
+            return self.run_stats["wall_seconds"] / self.run_stats["audio_seconds"], "this run"
+        return RuntimePredictor().rtf(self.model_name, self.engine_name, cascade=self.cascade_model_name,
+                                      window_cache=self.window_cache is not None, threads=self.threads)
+    
+    def update_progress_display(self, current_segment, total_segments):
         if self.start_time is None:
             self.start_time = time.time()
         
         elapsed_time = time.time() - self.start_time
-        progress_percent = (current_segment / total_segments) * 100
+        total_duration = self.total_duration or 0
+        progress_percent = (self.processed_duration / total_duration * 100) if total_duration else 0
         
-        if current_segment > 0:
-            time_per_segment = elapsed_time / current_segment
-            remaining_segments = total_segments - current_segment
-            eta_seconds = remaining_segments * time_per_segment
-            eta_str = str(timedelta(seconds=int(eta_seconds)))
-        else:
-            eta_str = "Calculating..."
+        # Weighted by audio seconds, so the short final segment and resumed
+        # segments do not skew the estimate
+        rtf, _ = self.predicted_rtf()
+        eta_seconds = max(0.0, total_duration - self.processed_duration) * rtf
+        eta_str = str(timedelta(seconds=int(eta_seconds)))
         
-        self.logger.info(f"Progress: {current_segment}/{total_segments} ({progress_percent:.1f}%) | "
+        self.logger.info(f"Progress: {current_segment}/{total_segments} ({progress_percent:.1f}% of audio) | "
                         f"Elapsed: {timedelta(seconds=int(elapsed_time))} | ETA: {eta_str}")
     
+    def record_throughput(self):
+        from throughput_history import record_run
+        
+        stats = self.run_stats
+        if stats["audio_seconds"] <= 0:
+            return
+        try:
+            record_run(self.model_name, self.engine_name, stats["audio_seconds"], stats["wall_seconds"],
+                       speech_seconds=stats["speech_seconds"], cascade=self.cascade_model_name,
+                       threads=self.threads, **self.window_cache_stats())
+        except OSError as e:
+            self.logger.warning(f"Could not record throughput history: {e}")
+    
+    def window_cache_stats(self):
+        cache = self.window_cache
+        if cache is None:
+            return {}
+        return {"window_hit_rate": round(cache.hit_rate, 4),
+                "window_saved_seconds": round(cache.saved_seconds, 2)}
+    
     def combine_results(self, all_results):
         self.logger.info("Combining transcription results...")
         
@@ -203,7 +388,9 @@ class WhisperTranscriptionManager:
         full_json_data = {
             "text": "",
             "segments": [],
-            "language": "en"
+            "language": "en",
+            "model": self.model_name,
+            "engine": self.engine_name
         }
         
         srt_counter = 1
@@ -242,82 +429,325 @@ class WhisperTranscriptionManager:
         except Exception as e:
             self.logger.error(f"Error saving combined results: {e}")
     
-    def transcribe_complete_video(self, resume=True):
-        self.logger.info("Starting complete video transcription...")
+    def segment_file(self, segment_number):
+        return self.segments_dir / f"segment_{segment_number:03d}_transcript.json"
+    
+    def completed_segments(self):
+        """Segment numbers (1-based) whose results are saved on disk"""
+        completed = []
+        for path in self.segments_dir.glob("segment_*_transcript.json"):
+            try:
+                completed.append(int(path.name.split("_")[1]))
+            except ValueError:
+                continue
+        return sorted(completed)
+    
+    def load_segment_result(self, segment_number):
+        segment_file = self.segment_file(segment_number)
+        if not segment_file.exists():
+            return None
+        try:
+            with open(segment_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Could not load segment {segment_number}: {e}")
+            return None
+    
+    def lease_lost(self, lease, segment_num):
+        """True if another worker has taken over the lease for this segment"""
+        if lease is None:
+            return False
+        lease.heartbeat()
+        if lease.lost:
+            self.logger.warning(f"Lease for segment {segment_num + 1} was taken over; leaving it to the new holder")
+        return lease.lost
+    
+    def process_segment(self, segment_num, total_segments, segment_duration, total_duration, lease=None):
+        """
+        Extract, transcribe and save one segment (0-based index); returns the result or None.
+        With a work queue lease, stops as soon as the lease turns out to be lost.
+        """
+        self.logger.info(f"\nProcessing segment {segment_num + 1}/{total_segments}")
+        
+        start_time = segment_num * segment_duration
+        current_segment_duration = min(segment_duration, total_duration - start_time)
+        
+        # Per-process temp file so several workers can share an output directory
+        audio_file = self.segments_dir / f"temp_segment_{segment_num + 1:03d}_{os.getpid()}.wav"
         
+        if self.cascade_model_name:
+            self.load_cascade_model()
+        self.load_whisper_model()
+        started = time.time()
+        
+        try:
+            if not self.extract_audio_segment(start_time, current_segment_duration, audio_file):
+                self.logger.error(f"Failed to extract segment {segment_num + 1}")
+                return None
+            if self.lease_lost(lease, segment_num):
+                return None
+            
+            result = self.transcribe_segment(audio_file, start_time, current_segment_duration)
+        finally:
+            if audio_file.exists():
+                audio_file.unlink()
+        
+        if result:
+            self.run_stats["wall_seconds"] += time.time() - started
+            self.processed_duration += current_segment_duration
+        
+        if result and self.lease_lost(lease, segment_num):
+            return None
+        
+        if result:
+            try:
+                write_json_atomic(self.segment_file(segment_num + 1), result)
+            except Exception as e:
+                self.logger.error(f"Error saving segment result: {e}")
+        
+        return result
+    
+    def segment_layout(self):
+        """Return (total_duration, segment_duration, total_segments) for the current settings"""
         total_duration = self.get_video_duration()
         segment_duration = self.segment_minutes * 60
         total_segments = int((total_duration + segment_duration - 1) // segment_duration)
+        return total_duration, segment_duration, total_segments
+    
+    def transcribe_complete_video(self, resume=True):
+        """Transcribe every segment not done yet; returns True if all segments succeeded"""
+        self.logger.info("Starting complete video transcription...")
+        
+        # Saved segment numbers only make sense with the length they were cut at
+        requested_minutes = self.segment_minutes
+        if resume and self.read_shared_layout() and self.segment_minutes != requested_minutes:
+            self.logger.info(f"Resuming with the {self.segment_minutes} min segments of the previous run "
+                             f"instead of {requested_minutes} min")
+        
+        total_duration, segment_duration, total_segments = self.segment_layout()
         
         self.logger.info(f"Video: {self.source_video}")
         self.logger.info(f"Duration: {timedelta(seconds=int(total_duration))}")
         self.logger.info(f"Segments: {total_segments} x {self.segment_minutes}min each")
         
-        processed_segments, start_segment = ([], 0) if not resume else self.load_progress()
-        all_results = []
-        
-        if resume and processed_segments:
-            for i in range(len(processed_segments)):
-                segment_file = self.segments_dir / f"segment_{i+1:03d}_transcript.json"
-                if segment_file.exists():
-                    try:
-                        with open(segment_file, "r") as f:
-                            result = json.load(f)
-                        all_results.append(result)
-                    except Exception as e:
-                        self.logger.warning(f"Could not load segment {i+1}: {e}")
-                        all_results.append(None)
-                else:
-                    all_results.append(None)
+        processed_segments, _ = ([], 0) if not resume else self.load_progress()
+        all_results = [None] * total_segments
         
-        for segment_num in range(start_segment, total_segments):
-            if segment_num < len(processed_segments):
-                continue
-            
-            self.logger.info(f"\nProcessing segment {segment_num + 1}/{total_segments}")
-            
-            start_time = segment_num * segment_duration
-            current_segment_duration = min(segment_duration, total_duration - start_time)
-            
-            audio_file = Path(f"temp_segment_{segment_num + 1:03d}.wav")
-            
-            if not self.extract_audio_segment(start_time, current_segment_duration, audio_file):
-                self.logger.error(f"Failed to extract segment {segment_num + 1}")
+        for segment_num in range(total_segments):
+            if segment_num + 1 in processed_segments:
+                all_results[segment_num] = self.load_segment_result(segment_num + 1)
+                if all_results[segment_num] is not None:
+                    self.processed_duration += min(segment_duration, total_duration - segment_num * segment_duration)
+                    continue
+                processed_segments.remove(segment_num + 1)
+        
+        remaining_audio = total_duration - self.processed_duration
+        if remaining_audio > 0:
+            rtf, source = self.predicted_rtf()
+            self.logger.info(f"Predicted time for {timedelta(seconds=int(remaining_audio))} of audio: "
+                             f"{timedelta(seconds=int(remaining_audio * rtf))} (RTF {rtf:.2f}, {source})")
+        self.start_time = time.time()
+        
+        for segment_num in range(total_segments):
+            if all_results[segment_num] is not None:
                 continue
             
-            result = self.transcribe_segment(audio_file, start_time)
-            
+            result = self.process_segment(segment_num, total_segments, segment_duration, total_duration)
+            all_results[segment_num] = result
             if result:
-                segment_file = self.segments_dir / f"segment_{segment_num + 1:03d}_transcript.json"
-                try:
-                    with open(segment_file, "w") as f:
-                        json.dump(result, f, indent=2)
-                except Exception as e:
-                    self.logger.error(f"Error saving segment result: {e}")
-                
-                all_results.append(result)
                 processed_segments.append(segment_num + 1)
-            else:
-                all_results.append(None)
             
-            self.update_progress_display(segment_num + 1, total_segments, current_segment_duration)
+            self.update_progress_display(segment_num + 1, total_segments)
             self.save_progress(processed_segments, segment_num + 1)
-            
-            if audio_file.exists():
-                audio_file.unlink()
         
-        if all_results:
+        if any(all_results):
             self.combine_results(all_results)
             
             total_time = time.time() - self.start_time if self.start_time else 0
             self.logger.info(f"TRANSCRIPTION COMPLETE!")
             self.logger.info(f"Total processing time: {timedelta(seconds=int(total_time))}")
             self.logger.info(f"Processed segments: {len(processed_segments)}/{total_segments}")
+            if not all(all_results):
+                self.logger.warning(f"{all_results.count(None)} segment(s) failed; run again to retry them")
+            self.log_run_stats()
+            self.record_throughput()
         else:
             self.logger.error("No segments were successfully transcribed")
+        return all(all_results)
+    
+    def align_words(self, ranges=None, max_span_seconds=600):
+        """
+        Add word timings to segments of the finished transcript that lack them,
+        limited to (start, end) second ranges if given, and save them in _data.json.
+        """
+        import whisper
+        
+        with open(self.final_json, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        
+        pending = [segment for segment in data["segments"]
+                   if "words" not in segment
+                   and (not ranges or any(segment["end"] > start and segment["start"] < end
+                                          for start, end in ranges))]
+        if not pending:
+            self.logger.info("No segments need word alignment")
+            return 0
+        
+        # Extract audio once per run of nearby segments, bounded to keep memory flat
+        spans = [[pending[0]]]
+        for segment in pending[1:]:
+            span = spans[-1]
+            if segment["start"] - span[-1]["end"] <= 30 and segment["end"] - span[0]["start"] <= max_span_seconds:
+                span.append(segment)
+            else:
+                spans.append([segment])
+        
+        self.load_whisper_model()
+        started = time.time()
+        self.logger.info(f"Aligning words for {len(pending)} segment(s) in {len(spans)} span(s)")
+        
+        for span in spans:
+            start = span[0]["start"]
+            audio_file = self.segments_dir / f"temp_segment_align_{os.getpid()}.wav"
+            try:
+                if not self.extract_audio_segment(start, span[-1]["end"] - start + 1, audio_file):
+                    self.logger.error(f"Failed to extract audio at {timedelta(seconds=int(start))}")
+                    continue
+                audio = whisper.load_audio(str(audio_file))
+                self.engine.align_words(audio, span, language=data.get("language", "en"), offset=start)
+            finally:
+                if audio_file.exists():
+                    audio_file.unlink()
+        
+        write_json_atomic(self.final_json, data)
+        self.logger.info(f"Word alignment saved to {self.final_json} "
+                         f"({timedelta(seconds=int(time.time() - started))})")
+        return len(pending)
+    
+    def read_shared_layout(self):
+        """Adopt segment length and duration from the progress file; returns True if read"""
+        try:
+            with open(self.progress_file, "r") as f:
+                progress_data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.logger.warning(f"Could not read shared progress: {e}")
+            return False
+        
+        self.segment_minutes = progress_data.get("segment_minutes") or self.segment_minutes
+        self.total_duration = progress_data.get("total_duration") or self.total_duration
+        return True
+    
+    def adopt_shared_layout(self):
+        """Use the segment layout already published by another worker, or publish ours"""
+        if not self.read_shared_layout():
+            total_duration = self.get_video_duration()
+            published = create_json_exclusive(self.progress_file, {
+                "timestamp": datetime.now().isoformat(),
+                "processed_segments": self.completed_segments(),
+                "current_segment": None,
+                "total_duration": total_duration,
+                "segment_minutes": self.segment_minutes
+            })
+            # Another worker published first: its layout wins, or our segment
+            # numbers would cover different time ranges than its
+            if not published and not self.read_shared_layout():
+                raise RuntimeError(f"Could not read the segment layout published in {self.progress_file}")
+        
+        return self.segment_layout()
+    
+    def transcribe_distributed(self, queue, skip_segments=None):
+        """
+        Transcribe whichever segments of this video no other worker holds.
+        Returns "complete", "waiting" (segments leased elsewhere) or "incomplete".
+        """
+        total_duration, segment_duration, total_segments = self.adopt_shared_layout()
+        skip_segments = set() if skip_segments is None else skip_segments
+        waiting = False
+        
+        for segment_num in range(total_segments):
+            if self.segment_file(segment_num + 1).exists() or segment_num + 1 in skip_segments:
+                continue
+            
+            lease = queue.claim(self.segments_dir / f"segment_{segment_num + 1:03d}.lease")
+            if lease is None:
+                waiting = True
+                continue
+            
+            try:
+                # Re-check: the previous holder may have finished just before we claimed
+                if not self.segment_file(segment_num + 1).exists():
+                    result = self.process_segment(segment_num, total_segments, segment_duration,
+                                                  total_duration, lease=lease)
+                    if lease.lost:
+                        waiting = True  # another worker holds it now
+                    elif result is None:
+                        skip_segments.add(segment_num + 1)
+            finally:
+                queue.release(lease)
+            
+            self.save_progress(self.completed_segments(), segment_num + 1)
+        
+        self.record_throughput()
+        if len(self.completed_segments()) < total_segments:
+            return "waiting" if waiting else "incomplete"
+        
+        lease = queue.claim(self.segments_dir / "combine.lease")
+        if lease is None:
+            return "waiting"
+        try:
+            if not self.final_json.exists():
+                self.combine_results([self.load_segment_result(n + 1) for n in range(total_segments)])
+        finally:
+            queue.release(lease)
+        return "complete"
+
+def transcription_complete(video, output_dir=None):
+    """
+    True if a video's outputs cover all of it: _data.json exists and its
+    progress file (if still there) lists every segment. Outputs combined from
+    a run where some segments failed do not count, so the video is retried.
+    """
+    video_path = Path(video)
+    output_dir = Path(output_dir) if output_dir else video_path.parent
+    if not (output_dir / f"{video_path.stem}_data.json").exists():
+        return False
+    try:
+        with open(output_dir / f".{video_path.stem}_progress.json", "r") as f:
+            progress_data = json.load(f)
+    except FileNotFoundError:
+        return True  # progress already cleaned up; outputs are final
+    except (OSError, ValueError):
+        return False
+    try:
+        segment_duration = progress_data["segment_minutes"] * 60
+        total_segments = int((progress_data["total_duration"] + segment_duration - 1) // segment_duration)
+    except (KeyError, TypeError):
+        return False
+    return len(set(progress_data.get("processed_segments") or [])) >= total_segments
+
+def parse_time_range(text):
+    """Parse 'START-END' with times as seconds or [HH:]MM:SS into a (start, end) tuple"""
+    def to_seconds(value):
+        seconds = 0.0
+        for part in value.strip().split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    
+    try:
+        start, end = text.split("-", 1)
+        start, end = to_seconds(start), to_seconds(end)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid range '{text}', expected START-END, e.g. 0:10:00-0:20:00")
+    if end <= start:
+        raise argparse.ArgumentTypeError(f"range end must be after start: '{text}'")
+    return start, end
 
 def interactive_transcribe():
     """Interactive launcher for transcription"""
+    from autotune import cached_settings
+    
     print("Whisper Transcription System")
     print("=" * 40)
     
@@ -345,10 +775,13 @@ def interactive_transcribe():
         model = "base"
         print("Using default model: base")
     
+    # Default to this host's calibrated segment length when there is one
+    tuned = cached_settings(model) or {}
+    default_minutes = tuned.get("segment_minutes", 30)
     try:
-        segment_minutes = int(input("Segment duration in minutes (default=30): ") or 30)
+        segment_minutes = int(input(f"Segment duration in minutes (default={default_minutes}): ") or default_minutes)
     except:
-        segment_minutes = 30
+        segment_minutes = default_minutes
     
     resume = input("Resume from existing progress? (Y/n): ").strip().lower() != 'n'
     
@@ -359,71 +792,333 @@ def interactive_transcribe():
     print(f"   Resume: {'Yes' if resume else 'No'}")
     
     manager = WhisperTranscriptionManager(video_path, model_name=model)
-    manager.segment_minutes = segment_minutes
     
     try:
+        manager.apply_tuning(segment_minutes=segment_minutes)
         manager.transcribe_complete_video(resume=resume)
     except KeyboardInterrupt:
         print("\nTranscription interrupted. Progress saved.")
     except Exception as e:
         print(f"\nError during transcription: {e}")
 
-def cleanup_transcription_files():
-    """Clean up temporary transcription files"""
+def cleanup_transcription_files(directory, dry_run=False, assume_yes=False, workers=None, categories=None):
+    """
+    Clean up transcription artifacts below a directory in a single pass.
+    Only temporary files unless other categories are asked for explicitly.
+    """
+    categories = expand_categories(categories or ["temp"])
     print("Transcription Cleanup Utility")
     print("=" * 40)
+    print(f"Directory: {os.path.abspath(directory)}")
+    print(f"\nThis will {'count' if dry_run else 'remove'}:")
+    for category in categories:
+        print(f"  - {CATEGORY_LABELS[category]}")
+    
+    if not dry_run and not assume_yes:
+        if input("\nContinue? (y/N): ").strip().lower() != 'y':
+            print("Cancelled")
+            return
+        # Any directory named segments/ matches; confirm it separately
+        if "legacy_segments" in categories and input(
+                "Also remove every directory named 'segments' and all its contents? (y/N): "
+        ).strip().lower() != 'y':
+            categories.remove("legacy_segments")
+    
+    print()
+    result = scan_tree(directory, delete=not dry_run, workers=workers, categories=categories)
+    
+    if result.total_count == 0:
+        print("No transcription artifacts found")
+        return
+    
+    print_scan_summary(result)
+    if dry_run:
+        print("\nDry run - nothing was removed")
+    else:
+        print(f"\nCleanup complete. Items removed: {result.total_count - len(result.errors)}")
+
+def show_disk_usage(directory=".", workers=None):
+    """Show disk usage of transcription artifacts below a directory"""
+    print("Disk Usage Analysis")
+    print("=" * 30)
+    print(f"Directory: {os.path.abspath(directory)}")
+    
+    result = scan_tree(directory, workers=workers)
+    print_scan_summary(result)
+
+def estimate_runtime(path, model_name="base", engine_name="openai", workers=1, include_done=False,
+                     output_dir=None):
+    """
+    Predict wall time for a video or a whole tree before it is queued. Outputs
+    are looked for where transcribe (single video, default transcripts/) or
+    batch (next to each video) would write them, unless output_dir is given.
+    """
+    from scheduler import Job, order_jobs, predict_schedule, probe_durations
+    from throughput_history import RuntimePredictor
+    
+    print("Runtime Estimate")
+    print("=" * 60)
+    
+    if os.path.isfile(path):
+        videos = [os.path.abspath(path)]
+        output_dir = output_dir or "transcripts"
+    else:
+        videos = find_videos(path)
+    done = [v for v in videos if transcription_complete(v, output_dir)]
+    if not include_done:
+        videos = [v for v in videos if v not in done]
+    if not videos:
+        print("No videos to estimate")
+        return
+    
+    durations = probe_durations(videos)
+    rtf, source = RuntimePredictor().rtf(model_name, engine_name)
+    jobs = order_jobs([Job(path=v, duration=durations[v]) for v in videos], "sjf")
+    predict_schedule(jobs, workers=workers, rtf=rtf)
+    
+    print(f"Model: {model_name} ({engine_name} engine) | RTF: {rtf:.2f} ({source}) | "
+          f"Cores: {os.cpu_count()} | Workers: {workers}")
+    print()
+    for job in jobs:
+        if job.duration is None:
+            print(f"  {'unknown':>10}  {'?':>10}  {job.path}")
+        else:
+            print(f"  {str(timedelta(seconds=int(job.duration))):>10}  "
+                  f"{str(timedelta(seconds=int(job.duration * rtf))):>10}  {job.path}")
+    
+    total_audio = sum(job.duration or 0 for job in jobs)
+    unknown = sum(1 for job in jobs if job.duration is None)
+    print()
+    print(f"Videos: {len(jobs)}" + (f" ({unknown} with unknown duration, assumed 1 hour for wall time)" if unknown else "")
+          + (f" | Already transcribed, skipped: {len(done)}" if done and not include_done else ""))
+    print(f"Total audio: {timedelta(seconds=int(total_audio))}")
+    print(f"Processing time: {timedelta(seconds=int(total_audio * rtf))}")
+    print(f"Wall time with {workers} worker(s): "
+          f"{timedelta(seconds=int(max(job.predicted_finish for job in jobs)))}")
+
+def run_batch(directory, model_name="base", policy="sjf", workers=None,
+              priority_file=None, segment_minutes=None, redo=False, engine_name="openai",
+              defer_alignment=False, window_cache=False, autotune=True):
+    """Transcribe every video below a directory in duration-aware order"""
+    from scheduler import Job, load_priority_file, order_jobs, predict_schedule, probe_durations, summarize
+    from throughput_history import RuntimePredictor
+    from autotune import batch_settings, cached_settings, tuned_settings
+    
+    print("Batch Transcription")
+    print("=" * 60)
+    
+    videos = find_videos(directory)
+    if not redo:
+        videos = [v for v in videos if not transcription_complete(v)]
+    if not videos:
+        print("No videos to process")
+        return True
+    
+    print(f"Probing {len(videos)} video(s)...")
+    durations = probe_durations(videos)
+    jobs = [Job(path=v, duration=durations[v]) for v in videos]
+    
+    # Each job is a separate process: use the host calibration for whatever was
+    # not given (calibrating once here rather than in every job, and only if
+    # something is missing), then split the cores and memory between the jobs
+    tuned = cached_settings(model_name, engine_name) if autotune else None
+    if tuned is None and autotune and (workers is None or segment_minutes is None):
+        tuned = tuned_settings(create_engine(engine_name, model_name), model_name, engine_name)
+    if tuned is not None:
+        batch = batch_settings(tuned, workers)
+    else:
+        workers = workers or 1
+        batch = {"workers": workers, "segment_minutes": None,
+                 "threads": max(1, (os.cpu_count() or 1) // workers) if workers > 1 else None}
+    workers, threads = batch["workers"], batch["threads"]
+    segment_minutes = segment_minutes or batch["segment_minutes"]
+    
+    patterns = load_priority_file(priority_file) if priority_file else None
+    jobs = order_jobs(jobs, policy, patterns)
+    rtf, rtf_source = RuntimePredictor().rtf(model_name, engine_name, window_cache=window_cache, threads=threads)
+    predict_schedule(jobs, workers=workers, rtf=rtf)
+    
+    total_audio = sum(job.duration or 0 for job in jobs)
+    print(f"Policy: {policy} | Workers: {workers} | Model: {model_name} | RTF: {rtf:.2f} ({rtf_source})")
+    print(f"Total audio: {timedelta(seconds=int(total_audio))}")
+    print()
+    for i, job in enumerate(jobs, 1):
+        duration = timedelta(seconds=int(job.duration)) if job.duration is not None else "unknown"
+        print(f"  {i:>4}. [{duration}] ETA +{timedelta(seconds=int(job.predicted_finish))}  "
+              f"{os.path.relpath(job.path, directory)}")
+    print()
     
-    cleanup_items = [
-        "*_segment_*.wav", "transcript_*.txt", "whisper_transcript_*.txt", "whisper_transcript_*.srt",
-        "temp_minute_*.wav", "temp_segment_*.wav", "*.tmp"
-    ]
+    batch_start = time.time()
+    lock = threading.Lock()
+    finished = [0]
     
-    cleaned_count = 0
+    def run_job(job):
+        cmd = [sys.executable, os.path.abspath(__file__), "transcribe",
+               "--video", job.path, "--model", model_name, "--engine", engine_name,
+               "--output", str(Path(job.path).parent)]
+        if segment_minutes:
+            cmd += ["--segment-minutes", str(segment_minutes)]
+        if threads:
+            cmd += ["--threads", str(threads)]
+        if not autotune:
+            cmd.append("--no-autotune")
+        if defer_alignment:
+            cmd.append("--defer-alignment")
+        if window_cache:
+            cmd.append("--window-cache")
+        job.returncode = subprocess.run(cmd, stdin=subprocess.DEVNULL).returncode
+        job.actual_finish = time.time() - batch_start
+        with lock:
+            finished[0] += 1
+            status = "Success" if job.returncode == 0 else f"Failed ({job.returncode})"
+            print(f"[{finished[0]}/{len(jobs)}] {status}: {os.path.basename(job.path)} | "
+                  f"predicted +{timedelta(seconds=int(job.predicted_finish))}, "
+                  f"actual +{timedelta(seconds=int(job.actual_finish))}")
     
-    for pattern in cleanup_items:
-        for match in glob.glob(pattern):
+    # Submitting in order means a pool of N threads starts jobs in exactly
+    # the order (and onto the worker slots) the prediction assumed
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(run_job, jobs))
+    
+    summary = summarize(jobs)
+    failed = sum(1 for job in jobs if job.returncode != 0)
+    print("=" * 60)
+    print("Batch transcription complete!")
+    print(f"Succeeded: {len(jobs) - failed} | Failed: {failed}")
+    for key, label in (("predicted_finish", "Predicted"), ("actual_finish", "Actual")):
+        if key in summary:
+            stats = summary[key]
+            print(f"{label:>9} turnaround: median {timedelta(seconds=int(stats['median']))}, "
+                  f"mean {timedelta(seconds=int(stats['mean']))}, "
+                  f"makespan {timedelta(seconds=int(stats['makespan']))}")
+    print("=" * 60)
+    return failed == 0
+
+def run_watch(directory, model_name="base", engine_name="openai", segment_minutes=None,
+              settle_seconds=30, poll_interval=10, force_polling=False):
+    """Transcribe new or changed videos as they appear, keeping the model loaded"""
+    from folder_watcher import FolderWatcher
+    
+    jobs = queue.Queue()
+    queued = set()
+    lock = threading.Lock()
+    
+    def enqueue(video):
+        with lock:
+            if video in queued:
+                return
+            queued.add(video)
+        print(f"Queued: {video}")
+        jobs.put(video)
+    
+    def transcribe_worker():
+        engine = None
+        while True:
+            video = jobs.get()
+            if video is None:
+                return
+            video_path = Path(video)
+            # Outputs older than the video mean the video was replaced: start fresh
+            resume = not (video_path.parent / f"{video_path.stem}_data.json").exists()
+            manager = WhisperTranscriptionManager(video, output_dir=video_path.parent,
+                                                  model_name=model_name, engine_name=engine_name)
+            manager.engine = engine
             try:
-                os.remove(match)
-                print(f"  Removed: {match}")
-                cleaned_count += 1
+                manager.apply_tuning(segment_minutes=segment_minutes)
+                manager.transcribe_complete_video(resume=resume)
             except Exception as e:
-                print(f"  Error removing {match}: {e}")
+                print(f"Error processing {video}: {e}")
+            finally:
+                engine = manager.engine
+                with lock:
+                    queued.discard(video)
     
-    for dir_name in ["segments"]:
-        if os.path.isdir(dir_name):
-            if input(f"\nRemove directory '{dir_name}' and all contents? (y/N): ").strip().lower() == 'y':
-                try:
-                    shutil.rmtree(dir_name)
-                    print(f"  Removed directory: {dir_name}")
-                    cleaned_count += 1
-                except Exception as e:
-                    print(f"  Error removing {dir_name}: {e}")
+    watcher = FolderWatcher(directory, enqueue, settle_seconds=settle_seconds,
+                            poll_interval=poll_interval, force_polling=force_polling)
+    print(f"Watching: {watcher.root}")
+    print(f"Mode: {watcher.mode} | Settle: {settle_seconds}s | Model: {model_name} ({engine_name} engine)")
+    print("Press CTRL+C to stop")
     
-    print(f"\nCleanup complete. Items removed: {cleaned_count}")
+    worker = threading.Thread(target=transcribe_worker, daemon=True)
+    worker.start()
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\nStopping watcher. The current video keeps its progress and resumes next time.")
 
-def show_disk_usage():
-    """Show disk usage analysis"""
-    print("Disk Usage Analysis")
-    print("=" * 30)
+def run_autotune(model_name="base", engine_name="openai", seconds=8, force=False):
+    """Calibrate (or show) the tuned settings for this host and model"""
+    from autotune import AUTOTUNE_FILE, cached_settings, tuned_settings
     
-    total_size = 0
+    print("Host Auto-Tuning")
+    print("=" * 60)
+    settings = None if force else cached_settings(model_name, engine_name)
+    if settings is None:
+        settings = tuned_settings(create_engine(engine_name, model_name), model_name, engine_name,
+                                  force=True, seconds=seconds)
+    else:
+        print(f"Using cached calibration from {settings['calibrated']} (--force to recalibrate)")
+        for m in settings.get("measurements", []):
+            print(f"  threads={m['threads']:<3} RTF {m['rtf']:6.3f}  RSS {m['rss_mb'] or 0:7.0f} MB")
+    print("=" * 60)
+    print(f"Model: {model_name} ({engine_name} engine) | Cores: {settings['cores']}")
+    print(f"Single transcription:      {settings['threads']} thread(s), "
+          f"{settings['segment_minutes']} min segments, RTF {settings['rtf']:.3f}")
+    batch = settings["batch"]
+    print(f"Batch:                     {batch['workers']} worker(s) x {batch['threads']} thread(s), "
+          f"{batch['segment_minutes']} min segments")
+    print(f"Peak RSS:                  {settings['rss_mb']} MB")
+    print(f"Cache: {AUTOTUNE_FILE}")
+    print("=" * 60)
+
+def run_worker(directory, model_name="base", segment_minutes=None, lease_ttl=None,
+               poll_seconds=30, worker_id=None, engine_name="openai"):
+    """Cooperatively transcribe every video below a shared directory"""
+    from work_queue import DEFAULT_LEASE_TTL, WorkQueue
     
-    # Check for audio files
-    for audio_file in glob.glob("*.wav"):
-        if os.path.exists(audio_file):
-            size = os.path.getsize(audio_file)
-            print(f"  {audio_file}: {size/1024/1024:.1f} MB")
-            total_size += size
+    queue = WorkQueue(owner=worker_id, ttl=lease_ttl or DEFAULT_LEASE_TTL)
+    print(f"Worker {queue.owner} processing: {os.path.abspath(directory)}")
     
-    # Check transcripts directory
-    if os.path.isdir("transcripts"):
-        transcripts_size = sum(
-            f.stat().st_size for f in Path("transcripts").rglob("*") if f.is_file()
-        )
-        print(f"  transcripts/: {transcripts_size/1024/1024:.1f} MB")
-        total_size += transcripts_size
+    engine = None
+    failed_segments = {}
+    completed = 0
+    
+    try:
+        while True:
+            waiting = False
+            for video in find_videos(directory):
+                video_path = Path(video)
+                if transcription_complete(video):
+                    continue
+                
+                manager = WhisperTranscriptionManager(video, output_dir=video_path.parent,
+                                                      model_name=model_name, engine_name=engine_name)
+                manager.engine = engine
+                
+                try:
+                    manager.apply_tuning(segment_minutes=segment_minutes)
+                    status = manager.transcribe_distributed(
+                        queue, failed_segments.setdefault(video, set()))
+                except Exception as e:
+                    print(f"Error processing {video}: {e}")
+                    continue
+                finally:
+                    engine = manager.engine
+                
+                if status == "complete":
+                    completed += 1
+                elif status == "waiting":
+                    waiting = True
+            
+            if not waiting:
+                break
+            time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        print("\nWorker interrupted. Leases released.")
+    finally:
+        queue.close()
     
-    print(f"  Total: {total_size/1024/1024:.1f} MB")
+    print(f"Worker finished. Videos completed by this worker: {completed}")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -434,8 +1129,16 @@ Examples:
   %(prog)s                                    # Interactive mode
   %(prog)s transcribe                         # Interactive transcription
   %(prog)s transcribe --video video.mp4      # Direct transcription
-  %(prog)s cleanup                           # Clean temporary files
-  %(prog)s disk-usage                        # Show disk usage
+  %(prog)s align --video video.mp4 --range 0:10:00-0:20:00  # Word timings on demand
+  %(prog)s batch ~/videos --policy sjf       # Shortest videos first
+  %(prog)s watch ~/incoming --poll            # Transcribe new videos as they arrive
+  %(prog)s estimate ~/videos --model small  # Predict processing time
+  %(prog)s autotune --model small            # Calibrate threads/segments for this host
+  %(prog)s worker ~/nas/videos               # Share a tree with other workers
+  %(prog)s cleanup ~/videos --dry-run        # Count temp files without removing
+  %(prog)s cleanup ~/videos                  # Remove temp files recursively
+  %(prog)s cleanup ~/videos --categories all # Also progress, outputs and segments/ dirs
+  %(prog)s disk-usage ~/videos               # Show disk usage
         '''
     )
     
@@ -447,13 +1150,136 @@ Examples:
     p_transcribe.add_argument('--model', default='base', 
                              choices=['tiny', 'base', 'small', 'medium', 'large'], 
                              help='Whisper model to use (default: base)')
-    p_transcribe.add_argument('--segment-minutes', type=int, default=30, 
-                             help='Segment duration in minutes (default: 30)')
+    p_transcribe.add_argument('--engine', default='openai', choices=list(ENGINES),
+                             help='Inference engine: openai (stock) or int8 (quantized, CPU) (default: openai)')
+    p_transcribe.add_argument('--segment-minutes', type=int,
+                             help='Segment duration in minutes (default: host calibration, else 30)')
+    p_transcribe.add_argument('--threads', type=int,
+                             help='CPU threads for inference (default: host calibration)')
+    p_transcribe.add_argument('--no-autotune', action='store_true',
+                             help='Do not calibrate or apply tuned settings for this host')
     p_transcribe.add_argument('--no-resume', action='store_true', 
                              help='Start from beginning, ignore existing progress')
+    p_transcribe.add_argument('--defer-alignment', action='store_true',
+                             help='Skip word-level timestamps for speed; add them later with "align"')
+    p_transcribe.add_argument('--window-cache', action='store_true',
+                             help='Reuse transcripts of audio windows repeated across videos (intros, bumpers)')
+    p_transcribe.add_argument('--cascade', metavar='FAST_MODEL',
+                             choices=['tiny', 'base', 'small', 'medium', 'large'],
+                             help='Transcribe with FAST_MODEL first and re-transcribe only '
+                                  'low-confidence segments with --model')
+    p_transcribe.add_argument('--escalate-logprob', type=float,
+                             default=DEFAULT_ESCALATION_THRESHOLDS['logprob'],
+                             help='Escalate segments with avg_logprob below this (default: -1.0)')
+    p_transcribe.add_argument('--escalate-no-speech', type=float,
+                             default=DEFAULT_ESCALATION_THRESHOLDS['no_speech'],
+                             help='Escalate segments with no_speech_prob above this (default: 0.6)')
+    p_transcribe.add_argument('--escalate-compression', type=float,
+                             default=DEFAULT_ESCALATION_THRESHOLDS['compression_ratio'],
+                             help='Escalate segments with compression ratio above this (default: 2.4)')
+    
+    p_cleanup = subparsers.add_parser('cleanup', help='Remove transcription artifacts recursively')
+    p_cleanup.add_argument('directory', help='Directory to clean (searched recursively)')
+    p_cleanup.add_argument('--categories', nargs='+', metavar='NAME',
+                           choices=list(CATEGORY_GROUPS) + list(CATEGORY_LABELS),
+                           help='What to remove: groups temp, state (progress, segment dirs, logs), '
+                                'outputs (transcripts, subtitles, JSON), legacy (any segments/ dir), all, '
+                                'or single categories (default: temp)')
+    p_cleanup.add_argument('--dry-run', action='store_true', help='Only count what would be removed')
+    p_cleanup.add_argument('-y', '--yes', action='store_true', help='Do not ask for confirmation')
+    p_cleanup.add_argument('--workers', type=int, help='Parallel directory scanners')
     
-    subparsers.add_parser('cleanup', help='Clean up temporary transcription files')
-    subparsers.add_parser('disk-usage', help='Show disk usage analysis')
+    p_align = subparsers.add_parser('align', help='Add word-level timestamps to a finished transcript')
+    p_align.add_argument('--video', required=True, help='Path to source video file')
+    p_align.add_argument('--output', default='transcripts', help='Output directory (default: transcripts)')
+    p_align.add_argument('--range', dest='ranges', action='append', type=parse_time_range,
+                         help='Only align START-END (seconds or HH:MM:SS); repeatable. Default: everything')
+    p_align.add_argument('--model', choices=['tiny', 'base', 'small', 'medium', 'large'],
+                         help='Model for alignment (default: the model that produced the transcript)')
+    p_align.add_argument('--engine', choices=list(ENGINES),
+                         help='Inference engine (default: the engine that produced the transcript)')
+    
+    p_batch = subparsers.add_parser('batch', help='Transcribe a directory tree in duration-aware order')
+    p_batch.add_argument('directory', help='Directory containing videos (searched recursively)')
+    p_batch.add_argument('--model', default='base',
+                         choices=['tiny', 'base', 'small', 'medium', 'large'],
+                         help='Whisper model to use (default: base)')
+    p_batch.add_argument('--engine', default='openai', choices=list(ENGINES),
+                         help='Inference engine: openai (stock) or int8 (quantized, CPU) (default: openai)')
+    p_batch.add_argument('--policy', default='sjf', choices=['sjf', 'ljf', 'priority', 'fifo'],
+                         help='sjf: shortest first, ljf: longest first, priority: --priority-file order, '
+                              'fifo: discovery order (default: sjf)')
+    p_batch.add_argument('--priority-file', help='Path patterns, one per line, highest priority first')
+    p_batch.add_argument('--workers', type=int,
+                         help='Concurrent transcriptions (default: host calibration, else 1)')
+    p_batch.add_argument('--segment-minutes', type=int,
+                         help='Segment duration in minutes (default: host calibration, else 30)')
+    p_batch.add_argument('--defer-alignment', action='store_true',
+                         help='Skip word-level timestamps for speed; add them later with "align"')
+    p_batch.add_argument('--window-cache', action='store_true',
+                         help='Reuse transcripts of audio windows repeated across videos (intros, bumpers)')
+    p_batch.add_argument('--no-autotune', action='store_true',
+                         help='Do not calibrate or apply tuned settings for this host')
+    p_batch.add_argument('--redo', action='store_true', help='Also re-run videos that already have outputs')
+    
+    p_estimate = subparsers.add_parser('estimate', help='Predict processing time for a video or directory tree')
+    p_estimate.add_argument('path', help='Video file or directory (searched recursively)')
+    p_estimate.add_argument('--model', default='base',
+                            choices=['tiny', 'base', 'small', 'medium', 'large'],
+                            help='Whisper model to use (default: base)')
+    p_estimate.add_argument('--engine', default='openai', choices=list(ENGINES),
+                            help='Inference engine (default: openai)')
+    p_estimate.add_argument('--workers', type=int, default=1, help='Concurrent transcriptions (default: 1)')
+    p_estimate.add_argument('--include-done', action='store_true',
+                            help='Include videos that already have outputs')
+    p_estimate.add_argument('--output',
+                            help='Output directory to check for finished videos '
+                                 '(default: transcripts for a video, next to each video for a directory)')
+    
+    p_worker = subparsers.add_parser('worker', help='Transcribe a shared tree cooperatively with other workers')
+    p_worker.add_argument('directory', help='Shared directory containing videos')
+    p_worker.add_argument('--model', default='base',
+                          choices=['tiny', 'base', 'small', 'medium', 'large'],
+                          help='Whisper model to use (default: base)')
+    p_worker.add_argument('--engine', default='openai', choices=list(ENGINES),
+                          help='Inference engine: openai (stock) or int8 (quantized, CPU) (default: openai)')
+    p_worker.add_argument('--segment-minutes', type=int,
+                          help='Segment duration for videos not yet started (default: host calibration, else 30)')
+    p_worker.add_argument('--lease-ttl', type=int,
+                          help='Seconds without heartbeat before a lease is reclaimed (default: 120)')
+    p_worker.add_argument('--poll-seconds', type=int, default=30,
+                          help='Wait between passes while other workers hold leases (default: 30)')
+    p_worker.add_argument('--worker-id', help='Worker name in lease files (default: host-pid-random)')
+    
+    p_watch = subparsers.add_parser('watch', help='Transcribe new or changed videos as they arrive')
+    p_watch.add_argument('directory', help='Directory tree to watch')
+    p_watch.add_argument('--model', default='base',
+                         choices=['tiny', 'base', 'small', 'medium', 'large'],
+                         help='Whisper model to use (default: base)')
+    p_watch.add_argument('--engine', default='openai', choices=list(ENGINES),
+                         help='Inference engine: openai (stock) or int8 (quantized, CPU) (default: openai)')
+    p_watch.add_argument('--segment-minutes', type=int,
+                         help='Segment duration in minutes (default: host calibration, else 30)')
+    p_watch.add_argument('--settle', type=int, default=30,
+                         help='Seconds a file must stop growing before it is queued (default: 30)')
+    p_watch.add_argument('--interval', type=int, default=10,
+                         help='Seconds between checks (default: 10)')
+    p_watch.add_argument('--poll', action='store_true',
+                         help='Force polling instead of inotify (needed for network mounts)')
+    
+    p_autotune = subparsers.add_parser('autotune', help='Calibrate thread count, workers and segment length for this host')
+    p_autotune.add_argument('--model', default='base',
+                            choices=['tiny', 'base', 'small', 'medium', 'large'],
+                            help='Whisper model to calibrate (default: base)')
+    p_autotune.add_argument('--engine', default='openai', choices=list(ENGINES),
+                            help='Inference engine (default: openai)')
+    p_autotune.add_argument('--seconds', type=int, default=8,
+                            help='Seconds of synthetic audio per measurement (default: 8)')
+    p_autotune.add_argument('--force', action='store_true', help='Recalibrate even if cached')
+    
+    p_usage = subparsers.add_parser('disk-usage', help='Show disk usage of transcription artifacts')
+    p_usage.add_argument('directory', nargs='?', default='.', help='Directory to analyse (default: .)')
+    p_usage.add_argument('--workers', type=int, help='Parallel directory scanners')
     
     args = parser.parse_args()
     
@@ -462,33 +1288,91 @@ Examples:
             print(f"Whisper Transcription System")
             print("=" * 50)
             print(f"Video: {args.video}")
-            print(f"Model: {args.model}")
+            print(f"Model: {args.model} ({args.engine} engine)")
             print(f"Output: {args.output}")
-            print(f"Segments: {args.segment_minutes} minutes")
+            print(f"Segments: {args.segment_minutes or 'auto'} minutes")
+            print(f"Threads: {args.threads or ('default' if args.no_autotune else 'auto')}")
             print(f"Resume: {'No' if args.no_resume else 'Yes'}")
+            if args.cascade:
+                print(f"Cascade: {args.cascade} -> {args.model}")
             print("=" * 50)
             
             manager = WhisperTranscriptionManager(
                 source_video=args.video,
                 output_dir=args.output,
-                model_name=args.model
+                model_name=args.model,
+                engine_name=args.engine
             )
-            manager.segment_minutes = args.segment_minutes
+            manager.word_timestamps = not args.defer_alignment
+            manager.cascade_model_name = args.cascade
+            manager.escalation_thresholds = {
+                "logprob": args.escalate_logprob,
+                "no_speech": args.escalate_no_speech,
+                "compression_ratio": args.escalate_compression
+            }
+            if args.window_cache:
+                manager.enable_window_cache()
             
+            complete = False
             try:
-                manager.transcribe_complete_video(resume=not args.no_resume)
+                manager.apply_tuning(args.segment_minutes, args.threads, autotune=not args.no_autotune)
+                complete = manager.transcribe_complete_video(resume=not args.no_resume)
             except KeyboardInterrupt:
                 print("\nTranscription interrupted. Progress saved.")
             except Exception as e:
                 print(f"\nError during transcription: {e}")
+            # batch counts a job as failed (and reruns resume it) unless every segment succeeded
+            if not complete:
+                sys.exit(1)
         else:
             interactive_transcribe()
     
+    elif args.command == 'align':
+        manager = WhisperTranscriptionManager(source_video=args.video, output_dir=args.output)
+        if not manager.final_json.exists():
+            print(f"Error: transcript data not found: {manager.final_json}")
+            sys.exit(1)
+        with open(manager.final_json, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        manager.model_name = args.model or data.get("model", "base")
+        manager.engine_name = args.engine or data.get("engine", "openai")
+        manager.align_words(args.ranges)
+    
+    elif args.command == 'batch':
+        if args.policy == 'priority' and not args.priority_file:
+            parser.error("--policy priority requires --priority-file")
+        ok = run_batch(args.directory, model_name=args.model, policy=args.policy,
+                       workers=args.workers, priority_file=args.priority_file,
+                       segment_minutes=args.segment_minutes, redo=args.redo,
+                       engine_name=args.engine, defer_alignment=args.defer_alignment,
+                       window_cache=args.window_cache, autotune=not args.no_autotune)
+        sys.exit(0 if ok else 1)
+    
+    elif args.command == 'watch':
+        run_watch(args.directory, model_name=args.model, engine_name=args.engine,
+                  segment_minutes=args.segment_minutes, settle_seconds=args.settle,
+                  poll_interval=args.interval, force_polling=args.poll)
+    
+    elif args.command == 'estimate':
+        estimate_runtime(args.path, model_name=args.model, engine_name=args.engine,
+                         workers=args.workers, include_done=args.include_done,
+                         output_dir=args.output)
+    
+    elif args.command == 'worker':
+        run_worker(args.directory, model_name=args.model, segment_minutes=args.segment_minutes,
+                   lease_ttl=args.lease_ttl, poll_seconds=args.poll_seconds, worker_id=args.worker_id,
+                   engine_name=args.engine)
+    
+    elif args.command == 'autotune':
+        run_autotune(model_name=args.model, engine_name=args.engine,
+                     seconds=args.seconds, force=args.force)
+    
     elif args.command == 'cleanup':
-        cleanup_transcription_files()
+        cleanup_transcription_files(args.directory, dry_run=args.dry_run, categories=args.categories,
+                                    assume_yes=args.yes, workers=args.workers)
     
     elif args.command == 'disk-usage':
-        show_disk_usage()
+        show_disk_usage(args.directory, workers=args.workers)
     
     else:
         interactive_transcribe()
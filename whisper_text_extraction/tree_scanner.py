@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Transcription Artifact Scanner
+Single-pass, parallel directory walker that classifies transcription artifacts.
+
+Each directory is listed exactly once with os.scandir; subdirectories are fanned
+out to a thread pool so slow network mounts are read concurrently. Matching
+files can be counted (dry run) or deleted during the same traversal.
+"""
+
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+VIDEO_EXTENSIONS = (
+    ".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv", ".webm", ".m4v", ".mpg", ".mpeg"
+)
+
+# (category, label, kind, pattern) - kind is "file" or "dir"; first match wins
+ARTIFACT_RULES = [
+    ("transcript", "Transcript files", "file", re.compile(r".+_transcript\.txt$")),
+    ("srt", "Subtitle files", "file", re.compile(r".+_subtitles\.srt$")),
+    ("json", "JSON data files", "file", re.compile(r".+_data\.json$")),
+    ("progress", "Progress files", "file", re.compile(r"^\..+_progress\.json$")),
+    ("segments", "Segment directories", "dir", re.compile(r"^\..+_segments$")),
+    ("legacy_progress", "Legacy progress", "file", re.compile(r"^transcription_progress\.json$")),
+    ("legacy_segments", "Legacy segments", "dir", re.compile(r"^segments$")),
+    ("log", "Log files", "file", re.compile(r"^transcription\.log$")),
+    ("temp_audio", "Temporary audio", "file", re.compile(r"^(temp_segment_|temp_minute_).*\.wav$")),
+    ("temp", "Temporary files", "file", re.compile(r".+\.tmp$")),
+]
+
+CATEGORY_LABELS = {category: label for category, label, _, _ in ARTIFACT_RULES}
+
+# Named selections for cleanup. Only "temp" is safe to remove without asking:
+# "state" loses resume progress, "outputs" are the finished transcripts and
+# "legacy" matches any directory called segments/.
+CATEGORY_GROUPS = {
+    "temp": ["temp_audio", "temp"],
+    "state": ["progress", "segments", "legacy_progress", "log"],
+    "outputs": ["transcript", "srt", "json"],
+    "legacy": ["legacy_segments"],
+}
+CATEGORY_GROUPS["all"] = list(CATEGORY_LABELS)
+
+def expand_categories(names):
+    """Category and group names to a list of categories, in rule order"""
+    selected = set()
+    for name in names:
+        if name in CATEGORY_GROUPS:
+            selected.update(CATEGORY_GROUPS[name])
+        elif name in CATEGORY_LABELS:
+            selected.add(name)
+        else:
+            raise ValueError(f"Unknown category '{name}'. Available: "
+                             f"{', '.join(list(CATEGORY_GROUPS) + list(CATEGORY_LABELS))}")
+    return [category for category in CATEGORY_LABELS if category in selected]
+
+@dataclass
+class CategoryStats:
+    count: int = 0
+    bytes: int = 0
+
+@dataclass
+class ScanResult:
+    """Per-category counts and sizes gathered by one traversal"""
+    root: str
+    deleted: bool = False
+    categories: dict = field(default_factory=lambda: {c: CategoryStats() for c in CATEGORY_LABELS})
+    videos: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    directories_scanned: int = 0
+
+    @property
+    def total_count(self):
+        return sum(stats.count for stats in self.categories.values())
+
+    @property
+    def total_bytes(self):
+        return sum(stats.bytes for stats in self.categories.values())
+
+def classify(name, is_dir):
+    """Return the artifact category for an entry name, or None"""
+    kind = "dir" if is_dir else "file"
+    for category, _, rule_kind, pattern in ARTIFACT_RULES:
+        if rule_kind == kind and pattern.match(name):
+            return category
+    return None
+
+def is_video(name):
+    return name.lower().endswith(VIDEO_EXTENSIONS)
+
+def _tree_size(path):
+    """Total size of files below path (used for matched artifact directories)"""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass
+    return total
+
+class TreeScanner:
+    """Walk a directory tree once, classifying (and optionally deleting) artifacts"""
+
+    def __init__(self, root, workers=None, delete=False, categories=None, collect_videos=False):
+        self.root = os.path.abspath(root)
+        self.workers = workers or min(32, (os.cpu_count() or 4) * 4)
+        self.delete = delete
+        self.categories = set(CATEGORY_LABELS) if categories is None else set(categories)
+        self.collect_videos = collect_videos
+        self._lock = threading.Lock()
+
+    def _record(self, result, category, size):
+        with self._lock:
+            stats = result.categories[category]
+            stats.count += 1
+            stats.bytes += size
+
+    def _remove(self, result, path, is_dir):
+        try:
+            if is_dir:
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError as e:
+            with self._lock:
+                result.errors.append(f"{path}: {e}")
+
+    def _scan_directory(self, path, result):
+        """List one directory; returns subdirectories still to be walked"""
+        subdirs = []
+        videos = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        category = classify(entry.name, is_dir)
+
+                        if category in self.categories:
+                            if is_dir:
+                                size = _tree_size(entry.path)
+                            else:
+                                size = entry.stat(follow_symlinks=False).st_size
+                            self._record(result, category, size)
+                            if self.delete:
+                                self._remove(result, entry.path, is_dir)
+                        elif is_dir:
+                            # Hidden segment directories only hold per-segment
+                            # results; every other directory may contain videos
+                            # or selected artifacts (a user folder may well be
+                            # called segments/)
+                            if category != "segments" or self.categories:
+                                subdirs.append(entry.path)
+                        elif category is None and self.collect_videos and is_video(entry.name):
+                            videos.append(entry.path)
+                    except OSError as e:
+                        with self._lock:
+                            result.errors.append(f"{entry.path}: {e}")
+        except OSError as e:
+            with self._lock:
+                result.errors.append(f"{path}: {e}")
+
+        with self._lock:
+            result.directories_scanned += 1
+            result.videos.extend(videos)
+        return subdirs
+
+    def scan(self):
+        result = ScanResult(root=self.root, deleted=self.delete)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._scan_directory, self.root, result)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for subdir in future.result():
+                        pending.add(pool.submit(self._scan_directory, subdir, result))
+
+        result.videos.sort()
+        return result
+
+def scan_tree(root, delete=False, workers=None, categories=None, collect_videos=False):
+    """Convenience wrapper around TreeScanner"""
+    return TreeScanner(root, workers=workers, delete=delete,
+                       categories=categories, collect_videos=collect_videos).scan()
+
+def find_videos(root, workers=None):
+    """Return all supported video files below root, sorted by path"""
+    return scan_tree(root, workers=workers, categories=[], collect_videos=True).videos
+
+def print_scan_summary(result):
+    verb = "Removed" if result.deleted else "Found"
+    print(f"{verb}:")
+    for category, stats in result.categories.items():
+        if stats.count:
+            print(f"  {CATEGORY_LABELS[category] + ':':<22}{stats.count:>6}  "
+                  f"{stats.bytes/1024/1024:10.1f} MB")
+    print(f"  {'Total items:':<22}{result.total_count:>6}  {result.total_bytes/1024/1024:10.1f} MB")
+    print(f"  Directories scanned:  {result.directories_scanned}")
+    for error in result.errors:
+        print(f"  Error: {error}")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Shared-Filesystem Work Queue
+Lease files that let any number of workers on any number of hosts split
+transcription work over a shared directory (NAS, NFS, SMB) without a server.
+
+A lease is a small JSON file created with O_CREAT | O_EXCL, so exactly one
+worker can hold it. Holders rewrite it every few seconds (heartbeat). A lease
+whose heartbeat has not changed for `ttl` seconds - measured on the observer's
+own clock, so host clock skew does not matter - belongs to a crashed worker and
+is reclaimed by renaming it away before claiming it again.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+from pathlib import Path
+
+from json_files import write_json_atomic
+
+DEFAULT_LEASE_TTL = 120
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class Lease:
+    """A single lease file held by this worker"""
+
+    def __init__(self, path, owner, ttl=DEFAULT_LEASE_TTL):
+        self.path = Path(path)
+        self.owner = owner
+        self.ttl = ttl
+        self.token = uuid.uuid4().hex
+        self.beat = 0
+        self.held = False
+        self.lost = False
+
+    def _content(self):
+        return {
+            "owner": self.owner,
+            "token": self.token,
+            "beat": self.beat,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "ttl": self.ttl,
+            "updated": time.time(),
+        }
+
+    def try_create(self):
+        """Atomically create the lease file; False if another worker holds it"""
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._content(), f)
+        self.held = True
+        self.lost = False
+        return True
+
+    def read(self):
+        """Return the current lease file content, or None if missing/unreadable"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def heartbeat(self):
+        """Refresh the lease; returns False (and marks it lost) if it was taken over"""
+        if not self.held:
+            return False
+        current = self.read()
+        if not current or current.get("token") != self.token:
+            self.held = False
+            self.lost = True
+            return False
+        self.beat += 1
+        try:
+            write_json_atomic(self.path, self._content())
+        except OSError:
+            return False
+        return True
+
+    def release(self):
+        if not self.held:
+            return
+        current = self.read()
+        if current and current.get("token") == self.token:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+        self.held = False
+
+class WorkQueue:
+    """Claims leases for work items and keeps them alive from a background thread"""
+
+    def __init__(self, owner=None, ttl=DEFAULT_LEASE_TTL, heartbeat_interval=None):
+        self.owner = owner or default_worker_id()
+        self.ttl = ttl
+        self.heartbeat_interval = heartbeat_interval or max(1.0, ttl / 4)
+        self._held = {}
+        self._observed = {}  # path -> (signature, first seen locally)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._thread.start()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            with self._lock:
+                leases = list(self._held.values())
+            for lease in leases:
+                lease.heartbeat()
+
+    def _signature(self, path):
+        """(signature, ttl) of a lease file; the signature changes with every heartbeat"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+            return (content.get("token"), content.get("beat")), content.get("ttl", self.ttl)
+        except ValueError:
+            return (None, os.stat(path).st_size), self.ttl
+
+    def _is_stale(self, path):
+        """Stale if the lease has not changed for ttl seconds of our own observation"""
+        try:
+            signature, ttl = self._signature(path)
+        except OSError:
+            return False
+
+        now = time.monotonic()
+        seen = self._observed.get(path)
+        if seen is None or seen[0] != signature:
+            self._observed[path] = (signature, now)
+            return False
+        return now - seen[1] > ttl
+
+    def _reclaim(self, path):
+        """Move a stale lease out of the way; returns True if the slot may be free"""
+        graveyard = path.with_name(f"{path.name}.stale.{uuid.uuid4().hex[:8]}")
+        seen = self._observed.pop(path, None)
+        if seen is None:
+            return False
+        stale_signature = seen[0]
+        try:
+            os.rename(path, graveyard)
+        except FileNotFoundError:
+            return True  # someone else reclaimed or released it
+        except OSError:
+            return False
+
+        # Between our staleness check and the rename another worker may have
+        # reclaimed and re-created the lease; if we moved a live lease, put it back
+        try:
+            moved_signature = self._signature(graveyard)[0]
+        except OSError:
+            moved_signature = None
+        try:
+            if moved_signature != stale_signature:
+                try:
+                    os.link(graveyard, path)
+                except FileExistsError:
+                    pass
+                return False
+            return True
+        finally:
+            os.unlink(graveyard)
+
+    def claim(self, path):
+        """Try to claim the work item guarded by a lease file; returns Lease or None"""
+        path = Path(path)
+        lease = Lease(path, self.owner, self.ttl)
+
+        if not lease.try_create():
+            if not self._is_stale(path) or not self._reclaim(path):
+                return None
+            if not lease.try_create():
+                return None
+
+        self._observed.pop(path, None)
+        with self._lock:
+            self._held[path] = lease
+        return lease
+
+    def is_leased(self, path):
+        """True if a live (non-stale) lease exists for path"""
+        path = Path(path)
+        return path.exists() and not self._is_stale(path)
+
+    def release(self, lease):
+        with self._lock:
+            self._held.pop(lease.path, None)
+        lease.release()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1)
+        with self._lock:
+            leases = list(self._held.values())
+            self._held.clear()
+        for lease in leases:
+            lease.release()